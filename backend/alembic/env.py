@@ -0,0 +1,49 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+from app.db import engine
+import app.models  # noqa: F401  (registers every table on SQLModel.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+
+def include_name(name, type_, parent_names):
+    # The FTS5 search table and its shadow tables are managed by migration 0003
+    return not (type_ == "table" and name.startswith("search_index"))
+
+
+def run_migrations_offline():
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_name=include_name,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,165 @@
+"""initial schema
+
+Tables as they were created by SQLModel.metadata.create_all before the
+project moved to migrations. Databases created that way already have them,
+so each table is only created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "classes" not in existing:
+        op.create_table(
+            "classes",
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("password_hash", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("otp_code", sa.String(), nullable=True),
+            sa.Column("otp_expires_at", sa.DateTime(), nullable=True),
+            sa.Column("username", sa.String(), nullable=True),
+            sa.Column("phone", sa.String(), nullable=True),
+            sa.Column("class_id", sa.Integer(), nullable=True),
+            sa.Column("user_type", sa.String(), nullable=True),
+            sa.ForeignKeyConstraint(["class_id"], ["classes.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"])
+
+    if "api_usages" not in existing:
+        op.create_table(
+            "api_usages",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("usage_date", sa.Date(), nullable=False),
+            sa.Column("request_count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_api_usages_user_id", "api_usages", ["user_id"])
+        op.create_index("ix_api_usages_usage_date", "api_usages", ["usage_date"])
+
+    if "subjects" not in existing:
+        op.create_table(
+            "subjects",
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("class_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["class_id"], ["classes.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "chapters" not in existing:
+        op.create_table(
+            "chapters",
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("subject_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "flashcards" not in existing:
+        op.create_table(
+            "flashcards",
+            sa.Column("question", sa.String(), nullable=False),
+            sa.Column("answer", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("chapter_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "mcqs" not in existing:
+        op.create_table(
+            "mcqs",
+            sa.Column("question", sa.String(), nullable=False),
+            sa.Column("option_a", sa.String(), nullable=False),
+            sa.Column("option_b", sa.String(), nullable=False),
+            sa.Column("option_c", sa.String(), nullable=False),
+            sa.Column("option_d", sa.String(), nullable=False),
+            sa.Column("correct", sa.String(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("chapter_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "progress" not in existing:
+        op.create_table(
+            "progress",
+            sa.Column("accuracy", sa.Float(), nullable=False),
+            sa.Column("streak", sa.Integer(), nullable=False),
+            sa.Column("last_practiced", sa.DateTime(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("chapter_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "user_reset_logs" not in existing:
+        op.create_table(
+            "user_reset_logs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("chapter_id", sa.Integer(), nullable=False),
+            sa.Column("reset_count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_user_reset_logs_user_id", "user_reset_logs", ["user_id"])
+        op.create_index("ix_user_reset_logs_chapter_id", "user_reset_logs", ["chapter_id"])
+
+    if "user_mcq_attempts" not in existing:
+        op.create_table(
+            "user_mcq_attempts",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("chapter_id", sa.Integer(), nullable=False),
+            sa.Column("mcq_id", sa.Integer(), nullable=False),
+            sa.Column("selected_answer", sa.String(), nullable=False),
+            sa.Column("is_correct", sa.Boolean(), nullable=False),
+            sa.Column("attempted_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+            sa.ForeignKeyConstraint(["mcq_id"], ["mcqs.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_user_mcq_attempts_user_id", "user_mcq_attempts", ["user_id"])
+        op.create_index("ix_user_mcq_attempts_chapter_id", "user_mcq_attempts", ["chapter_id"])
+
+
+def downgrade():
+    op.drop_table("user_mcq_attempts")
+    op.drop_table("user_reset_logs")
+    op.drop_table("progress")
+    op.drop_table("mcqs")
+    op.drop_table("flashcards")
+    op.drop_table("chapters")
+    op.drop_table("subjects")
+    op.drop_table("api_usages")
+    op.drop_table("users")
+    op.drop_table("classes")
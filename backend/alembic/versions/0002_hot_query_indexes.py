@@ -0,0 +1,63 @@
+"""hot query indexes
+
+Index the foreign keys every catalogue/question lookup filters on, and give
+progress and user_mcq_attempts composite indexes matching how the routers
+query them. (user_id, chapter_id) on progress and (user_id, mcq_id) on
+user_mcq_attempts become unique; existing duplicates are collapsed first.
+The single-column user_id index on user_mcq_attempts is dropped because both
+composites start with user_id.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_subjects_class_id", "subjects", ["class_id"])
+    op.create_index("ix_chapters_subject_id", "chapters", ["subject_id"])
+    op.create_index("ix_mcqs_chapter_id", "mcqs", ["chapter_id"])
+    op.create_index("ix_flashcards_chapter_id", "flashcards", ["chapter_id"])
+
+    # Keep the most recently practiced row per (user, chapter); the newer row wins a tie
+    op.execute(
+        """
+        DELETE FROM progress WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, chapter_id ORDER BY last_practiced DESC, id DESC
+                ) AS rank FROM progress
+            ) ranked WHERE rank = 1
+        )
+        """
+    )
+    op.create_index("uq_progress_user_chapter", "progress", ["user_id", "chapter_id"], unique=True)
+
+    # Keep the first answer per (user, question), matching save_attempt's semantics
+    op.execute(
+        """
+        DELETE FROM user_mcq_attempts WHERE id NOT IN (
+            SELECT MIN(id) FROM user_mcq_attempts GROUP BY user_id, mcq_id
+        )
+        """
+    )
+    op.create_index("uq_user_mcq_attempts_user_mcq", "user_mcq_attempts", ["user_id", "mcq_id"], unique=True)
+    op.create_index("ix_user_mcq_attempts_user_chapter", "user_mcq_attempts", ["user_id", "chapter_id"])
+    op.drop_index("ix_user_mcq_attempts_user_id", table_name="user_mcq_attempts")
+
+
+def downgrade():
+    op.create_index("ix_user_mcq_attempts_user_id", "user_mcq_attempts", ["user_id"])
+    op.drop_index("ix_user_mcq_attempts_user_chapter", table_name="user_mcq_attempts")
+    op.drop_index("uq_user_mcq_attempts_user_mcq", table_name="user_mcq_attempts")
+    op.drop_index("uq_progress_user_chapter", table_name="progress")
+    op.drop_index("ix_flashcards_chapter_id", table_name="flashcards")
+    op.drop_index("ix_mcqs_chapter_id", table_name="mcqs")
+    op.drop_index("ix_chapters_subject_id", table_name="chapters")
+    op.drop_index("ix_subjects_class_id", table_name="subjects")
@@ -0,0 +1,96 @@
+"""full-text search index
+
+SQLite only: an FTS5 table over MCQ and flashcard text, kept in sync by
+triggers so every writer (the API, AI generation, the content importer) is
+covered without application code. MCQs are stored at rowid 2*id and
+flashcards at 2*id+1, which keeps trigger deletes on the rowid index.
+Other databases fall back to LIKE queries and get nothing here.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+CLASS_OF_CHAPTER = (
+    "(SELECT subjects.class_id FROM chapters JOIN subjects ON subjects.id = chapters.subject_id "
+    "WHERE chapters.id = {chapter})"
+)
+MCQ_BODY = "{row}.option_a || ' ' || {row}.option_b || ' ' || {row}.option_c || ' ' || {row}.option_d"
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE search_index USING fts5(
+            question, body, chapter_id UNINDEXED, class_id UNINDEXED,
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        )
+        """
+    )
+
+    mcq_values = f"NEW.id * 2, NEW.question, {MCQ_BODY.format(row='NEW')}, NEW.chapter_id, " \
+                 f"{CLASS_OF_CHAPTER.format(chapter='NEW.chapter_id')}"
+    flashcard_values = f"NEW.id * 2 + 1, NEW.question, NEW.answer, NEW.chapter_id, " \
+                       f"{CLASS_OF_CHAPTER.format(chapter='NEW.chapter_id')}"
+    columns = "rowid, question, body, chapter_id, class_id"
+    for table, rowid, values in (
+        ("mcqs", "OLD.id * 2", mcq_values),
+        ("flashcards", "OLD.id * 2 + 1", flashcard_values),
+    ):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index ({columns}) VALUES ({values});
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_update AFTER UPDATE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+                INSERT INTO search_index ({columns}) VALUES ({values});
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+            END
+            """
+        )
+
+    # Index what is already there
+    op.execute(
+        f"""
+        INSERT INTO search_index ({columns})
+        SELECT mcqs.id * 2, mcqs.question, {MCQ_BODY.format(row='mcqs')}, mcqs.chapter_id, subjects.class_id
+        FROM mcqs JOIN chapters ON chapters.id = mcqs.chapter_id JOIN subjects ON subjects.id = chapters.subject_id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO search_index ({columns})
+        SELECT flashcards.id * 2 + 1, flashcards.question, flashcards.answer, flashcards.chapter_id, subjects.class_id
+        FROM flashcards JOIN chapters ON chapters.id = flashcards.chapter_id
+        JOIN subjects ON subjects.id = chapters.subject_id
+        """
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in ("mcqs", "flashcards"):
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{event}")
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,43 @@
+"""weekly reports
+
+Precomputed per-user weekly summaries written by the nightly report job
+(generate_reports.py) and read by /revision/report/weekly.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "weekly_reports",
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("correct", sa.Integer(), nullable=False),
+        sa.Column("accuracy", sa.Float(), nullable=False),
+        sa.Column("active_days", sa.Integer(), nullable=False),
+        sa.Column("chapters_practiced", sa.Integer(), nullable=False),
+        sa.Column("chapters_in_class", sa.Integer(), nullable=False),
+        sa.Column("coverage", sa.Float(), nullable=False),
+        sa.Column("best_streak", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("weakest_chapters", sa.JSON(), nullable=False),
+        sa.Column("generated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("uq_weekly_reports_user_week", "weekly_reports", ["user_id", "week_start"], unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_weekly_reports_user_week", table_name="weekly_reports")
+    op.drop_table("weekly_reports")
@@ -0,0 +1,51 @@
+"""attempt compaction
+
+attempt_summaries holds per-user, per-chapter totals for attempts folded out
+of user_mcq_attempts by compact_attempts.py. The raw rows move to
+user_mcq_attempts_archive, which keeps their original ids.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "attempt_summaries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("chapter_id", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("correct", sa.Integer(), nullable=False),
+        sa.Column("last_attempt_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["chapter_id"], ["chapters.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("uq_attempt_summaries_user_chapter", "attempt_summaries", ["user_id", "chapter_id"], unique=True)
+    op.create_table(
+        "user_mcq_attempts_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("chapter_id", sa.Integer(), nullable=False),
+        sa.Column("mcq_id", sa.Integer(), nullable=False),
+        sa.Column("selected_answer", sa.String(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.Column("attempted_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_mcq_attempts_archive")
+    op.drop_index("uq_attempt_summaries_user_chapter", table_name="attempt_summaries")
+    op.drop_table("attempt_summaries")
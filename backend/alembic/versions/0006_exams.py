@@ -0,0 +1,54 @@
+"""mock exams
+
+exam_papers holds the pre-built question lists per subject; exam_results one
+row per graded answer sheet, unique per started exam.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "exam_papers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=False),
+        sa.Column("mcq_ids", sa.JSON(), nullable=False),
+        sa.Column("duration_seconds", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_exam_papers_subject_id", "exam_papers", ["subject_id"])
+    op.create_table(
+        "exam_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("paper_id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("submitted_at", sa.DateTime(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("answered", sa.Integer(), nullable=False),
+        sa.Column("correct", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["paper_id"], ["exam_papers.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("uq_exam_results_user_paper_start", "exam_results", ["user_id", "paper_id", "started_at"],
+                    unique=True)
+
+
+def downgrade():
+    op.drop_index("uq_exam_results_user_paper_start", table_name="exam_results")
+    op.drop_table("exam_results")
+    op.drop_index("ix_exam_papers_subject_id", table_name="exam_papers")
+    op.drop_table("exam_papers")
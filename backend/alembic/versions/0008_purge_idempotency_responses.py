@@ -0,0 +1,24 @@
+"""purge stored idempotency responses
+
+Until now the middleware also stored /auth responses, whose bodies hold
+access tokens. Rows do not record their route, so every stored response is
+dropped. At worst a retry in flight during the upgrade runs once more.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM idempotency_keys")
+
+
+def downgrade():
+    pass
@@ -0,0 +1,43 @@
+"""answered mcqs
+
+answered_mcqs keeps the (user, question) pairs compaction moved out of
+user_mcq_attempts, so a compacted answer still blocks a second one. It is
+backfilled from the archive for chapters that still have a summary; a reset
+deletes the summary, and answers from before a reset no longer count.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "answered_mcqs",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("mcq_id", sa.Integer(), nullable=False),
+        sa.Column("chapter_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "mcq_id"),
+        sqlite_with_rowid=False,
+    )
+    op.execute(
+        """
+        INSERT INTO answered_mcqs (user_id, mcq_id, chapter_id)
+        SELECT archive.user_id, archive.mcq_id, MIN(archive.chapter_id)
+        FROM user_mcq_attempts_archive AS archive
+        JOIN attempt_summaries AS summary
+          ON summary.user_id = archive.user_id AND summary.chapter_id = archive.chapter_id
+        GROUP BY archive.user_id, archive.mcq_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("answered_mcqs")
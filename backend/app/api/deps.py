@@ -1,16 +1,17 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from jose import jwt, JWTError
 from app.core.config import settings
-from app.db import get_session
+from app.db import get_read_session
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_current_user(
-    session: Session = Depends(get_session), token: str = Depends(oauth2_scheme)
+async def get_current_user(
+    session: AsyncSession = Depends(get_read_session), token: str = Depends(oauth2_scheme)
 ) -> User:
     try:
         payload = jwt.decode(
@@ -22,7 +23,17 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, int(token_data.sub))
+    user = await session.get(User, int(token_data.sub))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
+
+
+def require_admin(x_admin_key: Optional[str] = Header(default=None)) -> None:
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_key != settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key",
+        )
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.api.deps import require_admin
+from app.core import profiling, query_stats
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/query-stats")
+async def get_query_stats():
+    """Per-route SQL statement counts, DB time and repeated (N+1) statement patterns."""
+    return query_stats.snapshot()
+
+
+@router.delete("/query-stats")
+async def reset_query_stats():
+    query_stats.reset()
+    return {"message": "query stats reset"}
+
+
+@router.get("/profiles")
+async def get_profiles():
+    """Routes with profiled requests and how many samples each has collected."""
+    return profiling.summary()
+
+
+@router.get("/profiles/stacks", response_class=PlainTextResponse)
+async def get_profile_stacks(route: str):
+    """Collapsed stacks for one route (e.g. `GET /api/v1/revision/daily`), for flamegraph.pl or speedscope."""
+    stacks = profiling.collapsed(route)
+    if stacks is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this route")
+    return stacks
+
+
+@router.delete("/profiles")
+async def reset_profiles():
+    profiling.reset()
+    return {"message": "profiles reset"}
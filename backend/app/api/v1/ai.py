@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 import json
-import httpx
-from app.db import get_session
+from app.db import get_read_session, get_session
 from app.api.deps import get_current_user
+from app.core.admission import AdmissionGate, Overloaded
 from app.core.config import settings
+from app.core.llm import AIProviderError, ProvidersUnavailable, build_router
+from app.core.pagination import invalidate_count
 from app.models.chapter import Chapter
 from app.models.subject import Subject
 from app.models.class_ import SchoolClass
@@ -16,40 +19,30 @@ from datetime import date
 
 router = APIRouter()
 
-# OpenRouter API config (OpenAI-compatible)
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
-OPENROUTER_MODEL = "google/gemma-3-4b-it:free"  # Confirmed working free-tier model
-
-
-def call_openrouter(prompt: str) -> str:
-    """Call OpenRouter API and return the text response."""
-    if not settings.OPENROUTER_API_KEY:
-        raise ValueError("OPENROUTER_API_KEY is not configured")
-
-    headers = {
-        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://ncertrevision.app",  # Optional: shown in OpenRouter dashboard
-        "X-Title": "NCERT Smart Revision",            # Optional: shown in OpenRouter dashboard
-    }
-
-    payload = {
-        "model": OPENROUTER_MODEL,
-        "messages": [
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "temperature": 0.7,
-        "max_tokens": 2048,
-    }
-
-    with httpx.Client(timeout=60.0) as client:
-        response = client.post(OPENROUTER_BASE_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+# Bounds concurrent provider calls so a burst of generation requests is shed
+# with 503 + Retry-After instead of queueing for up to a minute each
+ai_gate = AdmissionGate(
+    "ai",
+    limit=settings.AI_MAX_CONCURRENCY,
+    queue_size=settings.AI_QUEUE_SIZE,
+    queue_timeout=settings.AI_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.AI_RETRY_AFTER_SECONDS,
+)
+ai_router = build_router()
+
+
+async def call_llm(prompt: str) -> str:
+    """Generate with the routed AI providers; only an answer that parses as JSON counts."""
+    return await ai_router.complete(prompt, validate=lambda text: json.loads(clean_json_response(text)))
+
+
+def unavailable(error) -> HTTPException:
+    """503 for a shed request (Overloaded) or when every provider's breaker is open."""
+    return HTTPException(
+        status_code=503,
+        detail="AI generation is busy right now. Please try again shortly.",
+        headers={"Retry-After": str(error.retry_after)},
+    )
 
 
 def clean_json_response(text: str) -> str:
@@ -65,21 +58,29 @@ def clean_json_response(text: str) -> str:
 
 
 @router.post("/generate-mcq/{chapter_id}", response_model=List[MCQResponse])
-def generate_mcqs(*, session: Session = Depends(get_session), chapter_id: int, current_user=Depends(get_current_user)):
-    if not settings.OPENROUTER_API_KEY:
-        raise HTTPException(status_code=500, detail="OpenRouter API Key is not configured")
-
-    existing_mcqs = session.exec(select(MCQ).where(MCQ.chapter_id == chapter_id)).all()
+async def generate_mcqs(
+    *,
+    session: AsyncSession = Depends(get_session),
+    auth_session: AsyncSession = Depends(get_read_session),
+    chapter_id: int,
+    current_user=Depends(get_current_user),
+):
+    if not ai_router.providers:
+        raise HTTPException(status_code=500, detail="No AI provider API key is configured")
+
+    existing_mcqs = (await session.exec(select(MCQ).where(MCQ.chapter_id == chapter_id))).all()
     if len(existing_mcqs) >= 5:
         return existing_mcqs
+    # Detach them so the rollback on failure below doesn't expire the fallback result
+    session.expunge_all()
 
     # AI Rate Limiting logic
     today = date.today()
-    usage = session.exec(
+    usage = (await session.exec(
         select(ApiUsage)
         .where(ApiUsage.user_id == current_user.id)
         .where(ApiUsage.usage_date == today)
-    ).first()
+    )).first()
     if usage and usage.request_count >= 10:
         raise HTTPException(
             status_code=429,
@@ -87,13 +88,13 @@ def generate_mcqs(*, session: Session = Depends(get_session), chapter_id: int, c
         )
 
     # Fetch chapter context
-    chapter = session.get(Chapter, chapter_id)
+    chapter = await session.get(Chapter, chapter_id)
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
-    subject = session.get(Subject, chapter.subject_id)
+    subject = await session.get(Subject, chapter.subject_id)
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
-    school_class = session.get(SchoolClass, subject.class_id)
+    school_class = await session.get(SchoolClass, subject.class_id)
     if not school_class:
         raise HTTPException(status_code=404, detail="Class not found")
 
@@ -108,8 +109,14 @@ Return ONLY a valid JSON array, no markdown, no extra text. Each object must hav
 Example:
 [{{"question": "...", "option_a": "...", "option_b": "...", "option_c": "...", "option_d": "...", "correct": "A"}}]"""
 
+    # Give both connections back before waiting on the gate and the provider: the
+    # write session's, and the read one authentication used (the same session,
+    # cached per request). close() detaches current_user without expiring it.
+    await session.commit()
+    await auth_session.close()
     try:
-        text_response = call_openrouter(prompt)
+        async with ai_gate.slot():
+            text_response = await call_llm(prompt)
         mcq_list = json.loads(clean_json_response(text_response))
 
         new_mcqs = []
@@ -126,7 +133,8 @@ Example:
             session.add(mcq)
             new_mcqs.append(mcq)
 
-        session.commit()
+        await session.commit()
+        invalidate_count(MCQ, chapter_id)
 
         # Increment rate limit counter
         if not usage:
@@ -134,27 +142,30 @@ Example:
             session.add(usage)
         else:
             usage.request_count += 1
-        session.commit()
+        await session.commit()
 
         for mcq in new_mcqs:
-            session.refresh(mcq)
+            await session.refresh(mcq)
 
         return new_mcqs
 
+    except (Overloaded, ProvidersUnavailable) as e:
+        await session.rollback()
+        raise unavailable(e)
     except json.JSONDecodeError as e:
-        session.rollback()
+        await session.rollback()
         print(f"JSON parse error from AI: {e}")
         if existing_mcqs:
             return existing_mcqs
         raise HTTPException(status_code=500, detail="AI returned invalid JSON. Please try again.")
-    except httpx.HTTPStatusError as e:
-        session.rollback()
-        print(f"OpenRouter HTTP error: {e.response.status_code} - {e.response.text}")
+    except AIProviderError as e:
+        await session.rollback()
+        print(f"AI provider HTTP error: {e.status_code} - {e.text}")
         if existing_mcqs:
             return existing_mcqs
-        raise HTTPException(status_code=502, detail=f"AI service error: {e.response.status_code}")
+        raise HTTPException(status_code=502, detail=f"AI service error: {e.status_code}")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         print(f"Error generating MCQs: {e}")
         if existing_mcqs:
             return existing_mcqs
@@ -162,32 +173,40 @@ Example:
 
 
 @router.post("/generate-flashcard/{chapter_id}", response_model=List[FlashcardResponse])
-def generate_flashcards(*, session: Session = Depends(get_session), chapter_id: int, current_user=Depends(get_current_user)):
-    if not settings.OPENROUTER_API_KEY:
-        raise HTTPException(status_code=500, detail="OpenRouter API Key is not configured")
-
-    existing_fc = session.exec(select(Flashcard).where(Flashcard.chapter_id == chapter_id)).all()
+async def generate_flashcards(
+    *,
+    session: AsyncSession = Depends(get_session),
+    auth_session: AsyncSession = Depends(get_read_session),
+    chapter_id: int,
+    current_user=Depends(get_current_user),
+):
+    if not ai_router.providers:
+        raise HTTPException(status_code=500, detail="No AI provider API key is configured")
+
+    existing_fc = (await session.exec(select(Flashcard).where(Flashcard.chapter_id == chapter_id))).all()
     if len(existing_fc) >= 5:
         return existing_fc
+    # Detach them so the rollback on failure below doesn't expire the fallback result
+    session.expunge_all()
 
     # AI Rate Limiting logic
     today = date.today()
-    usage = session.exec(
+    usage = (await session.exec(
         select(ApiUsage)
         .where(ApiUsage.user_id == current_user.id)
         .where(ApiUsage.usage_date == today)
-    ).first()
+    )).first()
     if usage and usage.request_count >= 10:
         raise HTTPException(
             status_code=429,
             detail="You've exceeded today's AI limit of 10 requests. Please try again tomorrow! 🌟"
         )
 
-    chapter = session.get(Chapter, chapter_id)
+    chapter = await session.get(Chapter, chapter_id)
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
-    subject = session.get(Subject, chapter.subject_id)
-    school_class = session.get(SchoolClass, subject.class_id)
+    subject = await session.get(Subject, chapter.subject_id)
+    school_class = await session.get(SchoolClass, subject.class_id)
 
     prompt = f"""Generate 5 educational flashcards for Indian school students (NCERT/CBSE).
 Class: {school_class.name}
@@ -200,8 +219,14 @@ Return ONLY a valid JSON array, no markdown, no extra text. Each object must hav
 Example:
 [{{"question": "...", "answer": "..."}}]"""
 
+    # Give both connections back before waiting on the gate and the provider: the
+    # write session's, and the read one authentication used (the same session,
+    # cached per request). close() detaches current_user without expiring it.
+    await session.commit()
+    await auth_session.close()
     try:
-        text_response = call_openrouter(prompt)
+        async with ai_gate.slot():
+            text_response = await call_llm(prompt)
         fc_list = json.loads(clean_json_response(text_response))
 
         new_fcs = []
@@ -214,7 +239,8 @@ Example:
             session.add(fc)
             new_fcs.append(fc)
 
-        session.commit()
+        await session.commit()
+        invalidate_count(Flashcard, chapter_id)
 
         # Increment rate limit counter
         if not usage:
@@ -222,27 +248,30 @@ Example:
             session.add(usage)
         else:
             usage.request_count += 1
-        session.commit()
+        await session.commit()
 
         for fc in new_fcs:
-            session.refresh(fc)
+            await session.refresh(fc)
 
         return new_fcs
 
+    except (Overloaded, ProvidersUnavailable) as e:
+        await session.rollback()
+        raise unavailable(e)
     except json.JSONDecodeError as e:
-        session.rollback()
+        await session.rollback()
         print(f"JSON parse error from AI: {e}")
         if existing_fc:
             return existing_fc
         raise HTTPException(status_code=500, detail="AI returned invalid JSON. Please try again.")
-    except httpx.HTTPStatusError as e:
-        session.rollback()
-        print(f"OpenRouter HTTP error: {e.response.status_code} - {e.response.text}")
+    except AIProviderError as e:
+        await session.rollback()
+        print(f"AI provider HTTP error: {e.status_code} - {e.text}")
         if existing_fc:
             return existing_fc
-        raise HTTPException(status_code=502, detail=f"AI service error: {e.response.status_code}")
+        raise HTTPException(status_code=502, detail=f"AI service error: {e.status_code}")
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         print(f"Error generating Flashcards: {e}")
         if existing_fc:
             return existing_fc
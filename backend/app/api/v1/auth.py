@@ -1,16 +1,17 @@
 from datetime import timedelta, datetime, timezone
 import random
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db import get_session
 from app.models.user import User, UserCreate, UserResponse, OTPVerify, UserProfileUpdate
 from app.api.deps import get_current_user
-from app.core import security
+from app.core import metrics, security
 from app.core.config import settings
+from app.core.email import send_otp_email
 from app.schemas.token import Token
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -18,66 +19,9 @@ from slowapi.util import get_remote_address
 limiter = Limiter(key_func=get_remote_address)
 router = APIRouter()
 
-def send_otp_email(email: str, otp: str):
-    """Send OTP verification code via Gmail SMTP."""
-
-    smtp_email = getattr(settings, 'SMTP_EMAIL', None)
-    smtp_password = getattr(settings, 'SMTP_PASSWORD', None)
-
-    # Fallback if email not configured
-    if not smtp_email or not smtp_password:
-        print(f"\n{'='*40}\n📧 EMAIL SENT TO: {email}\n🔑 YOUR OTP CODE IS: {otp}\n{'='*40}\n")
-        return
-
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = "🔐 Your NCERT Revision Login OTP"
-        msg["From"] = smtp_email
-        msg["To"] = email
-
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; background-color: #f8fafc; padding: 30px;">
-            <div style="max-width: 480px; margin: 0 auto; background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
-                <div style="text-align: center; margin-bottom: 24px;">
-                    <h1 style="color: #22c55e; margin: 0; font-size: 28px;">📚 NCERT Revision</h1>
-                    <p style="color: #6b7280; margin-top: 8px;">Your One-Time Verification Code</p>
-                </div>
-                <div style="text-align: center; background: #f0fdf4; border-radius: 12px; padding: 24px; margin: 20px 0;">
-                    <p style="color: #6b7280; font-size: 14px; margin: 0 0 8px 0;">Your OTP Code is:</p>
-                    <h2 style="color: #111827; font-size: 36px; letter-spacing: 8px; margin: 0; font-weight: 800;">{otp}</h2>
-                </div>
-                <p style="color: #6b7280; font-size: 13px; text-align: center;">
-                    This code will expire in <strong>5 minutes</strong>.<br/>
-                    If you didn't request this, please ignore this email.
-                </p>
-                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 24px 0;" />
-                <p style="color: #9ca3af; font-size: 11px; text-align: center;">
-                    NCERT Smart Revision App • Made with ❤️ for Students
-                </p>
-            </div>
-        </body>
-        </html>
-        """
-
-        msg.attach(MIMEText(html_body, "html"))
-
-        # ✅ Gmail SMTP
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(smtp_email, smtp_password)
-            server.sendmail(smtp_email, email, msg.as_string())
-
-        print(f"✅ OTP email sent successfully to {email}")
-
-    except Exception as e:
-        print(f"❌ Failed to send OTP email: {e}")
-        print(f"🔑 Fallback — OTP for {email}: {otp}")
 @router.post("/signup", response_model=UserResponse)
-def signup(*, session: Session = Depends(get_session), user_in: UserCreate):
-    user = session.exec(select(User).where(User.email == user_in.email)).first()
+async def signup(*, session: AsyncSession = Depends(get_session), user_in: UserCreate):
+    user = (await session.exec(select(User).where(User.email == user_in.email))).first()
     if user:
         raise HTTPException(
             status_code=400,
@@ -85,18 +29,18 @@ def signup(*, session: Session = Depends(get_session), user_in: UserCreate):
         )
     user = User(
         email=user_in.email,
-        password_hash=security.get_password_hash(user_in.password),
+        password_hash=await run_in_threadpool(security.get_password_hash, user_in.password),
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 @router.post("/login")
 @limiter.limit("5/minute")
-def login(request: Request, *, session: Session = Depends(get_session), form_data: OAuth2PasswordRequestForm = Depends()):
-    user = session.exec(select(User).where(User.email == form_data.username)).first()
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+async def login(request: Request, *, session: AsyncSession = Depends(get_session), form_data: OAuth2PasswordRequestForm = Depends()):
+    user = (await session.exec(select(User).where(User.email == form_data.username))).first()
+    if not user or not await run_in_threadpool(security.verify_password, form_data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
     # Generate 6-digit OTP
@@ -105,16 +49,18 @@ def login(request: Request, *, session: Session = Depends(get_session), form_dat
     user.otp_expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
     
     session.add(user)
-    session.commit()
+    await session.commit()
     
-    send_otp_email(user.email, otp_code)
+    started = time.perf_counter()
+    outcome = await run_in_threadpool(send_otp_email, user.email, otp_code)
+    metrics.EMAIL_DURATION.observe(time.perf_counter() - started, outcome)
     
     return {"requires_otp": True, "user_id": user.id, "message": "OTP sent to your email"}
 
 @router.post("/verify-otp", response_model=Token)
 @limiter.limit("5/minute")
-def verify_otp(request: Request, *, session: Session = Depends(get_session), data: OTPVerify):
-    user = session.get(User, data.user_id)
+async def verify_otp(request: Request, *, session: AsyncSession = Depends(get_session), data: OTPVerify):
+    user = await session.get(User, data.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
@@ -128,7 +74,7 @@ def verify_otp(request: Request, *, session: Session = Depends(get_session), dat
     user.otp_code = None
     user.otp_expires_at = None
     session.add(user)
-    session.commit()
+    await session.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
@@ -140,23 +86,25 @@ def verify_otp(request: Request, *, session: Session = Depends(get_session), dat
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user)):
     """Return the authenticated user's profile."""
     return current_user
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_me(
+async def update_me(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     body: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
 ):
     """Update authenticated user's profile fields (partial update)."""
+    # current_user was loaded on the read pool; re-fetch it for writing
+    user = await session.get(User, current_user.id)
     update_data = body.model_dump(exclude_unset=True)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-    return current_user
+        setattr(user, field, value)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
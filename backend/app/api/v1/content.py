@@ -1,43 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from typing import List
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 from pydantic import BaseModel
-from app.db import get_session
+from app.core.config import settings
+from app.db import get_session, get_read_session
 from app.api.deps import get_current_user
+from app.core.pagination import PageParams, cached_count, chapter_page
+from app.core.responses import json_rows, model_columns
 from app.models.class_ import SchoolClass, SchoolClassResponse
 from app.models.subject import Subject, SubjectResponse
 from app.models.chapter import Chapter, ChapterResponse
 from app.models.flashcard import Flashcard, FlashcardResponse
 from app.models.mcq import MCQ, MCQResponse
 from app.models.user import User
-from app.models.mcq_attempt import UserMCQAttempt, UserResetLog
+from app.compaction import answered_mcq_ids
+from app.models.mcq_attempt import AnsweredMCQ, AttemptSummary, UserMCQAttempt, UserResetLog
 
 router = APIRouter()
 
 @router.get("/classes", response_model=List[SchoolClassResponse])
-def get_classes(*, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    classes = session.exec(select(SchoolClass)).all()
+async def get_classes(*, session: AsyncSession = Depends(get_read_session), current_user: User = Depends(get_current_user)):
+    classes = (await session.exec(select(SchoolClass))).all()
     return classes
 
 @router.get("/subjects/{class_id}", response_model=List[SubjectResponse])
-def get_subjects(*, session: Session = Depends(get_session), class_id: int, current_user: User = Depends(get_current_user)):
-    subjects = session.exec(select(Subject).where(Subject.class_id == class_id)).all()
+async def get_subjects(*, session: AsyncSession = Depends(get_read_session), class_id: int, current_user: User = Depends(get_current_user)):
+    subjects = (await session.exec(select(Subject).where(Subject.class_id == class_id))).all()
     return subjects
 
 @router.get("/chapters/{subject_id}", response_model=List[ChapterResponse])
-def get_chapters(*, session: Session = Depends(get_session), subject_id: int, current_user: User = Depends(get_current_user)):
-    chapters = session.exec(select(Chapter).where(Chapter.subject_id == subject_id)).all()
+async def get_chapters(*, session: AsyncSession = Depends(get_read_session), subject_id: int, current_user: User = Depends(get_current_user)):
+    chapters = (await session.exec(select(Chapter).where(Chapter.subject_id == subject_id))).all()
     return chapters
 
 @router.get("/flashcards/{chapter_id}", response_model=List[FlashcardResponse])
-def get_flashcards(*, session: Session = Depends(get_session), chapter_id: int, current_user: User = Depends(get_current_user)):
-    flashcards = session.exec(select(Flashcard).where(Flashcard.chapter_id == chapter_id)).all()
-    return flashcards
+async def get_flashcards(*, session: AsyncSession = Depends(get_read_session), chapter_id: int, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    """The chapter's flashcards; with `limit`, a page, and X-Next-Cursor goes in `after_id` for the next one."""
+    return await chapter_page(session, Flashcard, FlashcardResponse, chapter_id, page)
 
 @router.get("/mcqs/{chapter_id}", response_model=List[MCQResponse])
-def get_mcqs(*, session: Session = Depends(get_session), chapter_id: int, current_user: User = Depends(get_current_user)):
-    mcqs = session.exec(select(MCQ).where(MCQ.chapter_id == chapter_id)).all()
-    return mcqs
+async def get_mcqs(*, session: AsyncSession = Depends(get_read_session), chapter_id: int, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    """The chapter's MCQs, paged like flashcards; `fields=question,option_a,...` trims each row to those fields."""
+    return await chapter_page(session, MCQ, MCQResponse, chapter_id, page)
 
 
 # ─── MCQ Attempt History ───────────────────────────────────────────────────────
@@ -66,24 +74,19 @@ class ResetStatusResponse(BaseModel):
 MAX_RESETS = 2
 
 @router.post("/attempts", status_code=201)
-def save_attempt(
+async def save_attempt(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     body: AttemptCreate,
     current_user: User = Depends(get_current_user)
 ):
     """Save a user's answer to an MCQ. Silently skips if already answered."""
-    mcq = session.get(MCQ, body.mcq_id)
+    mcq = await session.get(MCQ, body.mcq_id)
     if not mcq:
         raise HTTPException(status_code=404, detail="MCQ not found")
 
-    # Skip if already attempted (prevent duplicates)
-    existing = session.exec(
-        select(UserMCQAttempt)
-        .where(UserMCQAttempt.user_id == current_user.id)
-        .where(UserMCQAttempt.mcq_id == body.mcq_id)
-    ).first()
-    if existing:
+    # Skip if already attempted (prevent duplicates), including answers compacted out of the hot table
+    if await answered_mcq_ids(session, current_user.id, [body.mcq_id]):
         return {"message": "already recorded"}
 
     attempt = UserMCQAttempt(
@@ -94,73 +97,66 @@ def save_attempt(
         is_correct=body.selected_answer.upper() == mcq.correct.upper()
     )
     session.add(attempt)
-    session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # A concurrent request recorded this answer first (unique user_id + mcq_id)
+        await session.rollback()
+        return {"message": "already recorded"}
     return {"message": "saved"}
 
 
 @router.get("/attempts/{chapter_id}", response_model=List[AttemptResponse])
-def get_attempts(
+async def get_attempts(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     chapter_id: int,
     current_user: User = Depends(get_current_user)
 ):
-    """Fetch all previously answered questions for a chapter."""
-    attempts = session.exec(
-        select(UserMCQAttempt)
+    """Fetch the questions answered in this chapter within the retention window."""
+    columns = model_columns(UserMCQAttempt, AttemptResponse, **{
+        field: getattr(MCQ, field) for field in ("question", "option_a", "option_b", "option_c", "option_d", "correct")
+    })
+    rows = (await session.exec(
+        select(*columns)
+        .join(MCQ, MCQ.id == UserMCQAttempt.mcq_id)
         .where(UserMCQAttempt.user_id == current_user.id)
         .where(UserMCQAttempt.chapter_id == chapter_id)
-    ).all()
-
-    result = []
-    for a in attempts:
-        mcq = session.get(MCQ, a.mcq_id)
-        if mcq:
-            result.append(AttemptResponse(
-                id=a.id,
-                mcq_id=a.mcq_id,
-                question=mcq.question,
-                option_a=mcq.option_a,
-                option_b=mcq.option_b,
-                option_c=mcq.option_c,
-                option_d=mcq.option_d,
-                correct=mcq.correct,
-                selected_answer=a.selected_answer,
-                is_correct=a.is_correct,
-            ))
-    return result
+        .order_by(UserMCQAttempt.id)
+    )).mappings()
+    return json_rows(rows)
 
 
 @router.get("/attempts/{chapter_id}/reset-status", response_model=ResetStatusResponse)
-def get_reset_status(
+async def get_reset_status(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     chapter_id: int,
     current_user: User = Depends(get_current_user)
 ):
-    log = session.exec(
+    log = (await session.exec(
         select(UserResetLog)
         .where(UserResetLog.user_id == current_user.id)
         .where(UserResetLog.chapter_id == chapter_id)
-    ).first()
+    )).first()
     count = log.reset_count if log else 0
     return ResetStatusResponse(reset_count=count, resets_remaining=MAX_RESETS - count)
 
 
 @router.delete("/attempts/{chapter_id}/reset")
-def reset_attempts(
+async def reset_attempts(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     chapter_id: int,
     current_user: User = Depends(get_current_user)
 ):
     """Clear all answers for this chapter. Allowed max 2 times."""
     # Check / create reset log
-    log = session.exec(
+    log = (await session.exec(
         select(UserResetLog)
         .where(UserResetLog.user_id == current_user.id)
         .where(UserResetLog.chapter_id == chapter_id)
-    ).first()
+    )).first()
 
     if log and log.reset_count >= MAX_RESETS:
         raise HTTPException(
@@ -169,13 +165,24 @@ def reset_attempts(
         )
 
     # Delete all attempts for this chapter
-    attempts = session.exec(
+    attempts = (await session.exec(
         select(UserMCQAttempt)
         .where(UserMCQAttempt.user_id == current_user.id)
         .where(UserMCQAttempt.chapter_id == chapter_id)
-    ).all()
+    )).all()
     for a in attempts:
-        session.delete(a)
+        await session.delete(a)
+    # ...and the totals and answered marks of any compacted ones (the archive keeps the raw history)
+    summary = (await session.exec(
+        select(AttemptSummary)
+        .where(AttemptSummary.user_id == current_user.id)
+        .where(AttemptSummary.chapter_id == chapter_id)
+    )).first()
+    if summary:
+        await session.delete(summary)
+    await session.exec(
+        delete(AnsweredMCQ).where(AnsweredMCQ.user_id == current_user.id, AnsweredMCQ.chapter_id == chapter_id)
+    )
 
     # Increment reset counter
     if not log:
@@ -184,6 +191,61 @@ def reset_attempts(
     else:
         log.reset_count += 1
 
-    session.commit()
+    await session.commit()
     count = log.reset_count
     return {"message": "reset successful", "reset_count": count, "resets_remaining": MAX_RESETS - count}
+
+
+# ─── Chapter Practice Session ──────────────────────────────────────────────────
+
+class ChapterSessionResponse(BaseModel):
+    chapter_id: int
+    mcqs: List[MCQResponse]  # first page; continue with /mcqs/{chapter_id}?after_id=next_cursor
+    next_cursor: Optional[int] = None
+    mcq_count: int
+    attempts: List[AttemptResponse]
+    reset_count: int
+    resets_remaining: int
+    flashcard_count: int
+
+@router.get("/chapters/{chapter_id}/session", response_model=ChapterSessionResponse)
+async def get_chapter_session(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    chapter_id: int,
+    limit: Optional[int] = Query(None, ge=1, description="MCQ page size (capped at PAGE_SIZE_MAX); all MCQs if omitted"),
+    current_user: User = Depends(get_current_user)
+):
+    """Everything the chapter practice screen needs in one request: at most five queries, none per row."""
+    query = select(*model_columns(MCQ, MCQResponse)).where(MCQ.chapter_id == chapter_id).order_by(MCQ.id)
+    if limit is not None:
+        limit = min(limit, settings.PAGE_SIZE_MAX)
+        query = query.limit(limit + 1)
+    mcqs = (await session.exec(query)).mappings().all()
+    attempt_columns = model_columns(UserMCQAttempt, AttemptResponse, **{
+        field: getattr(MCQ, field) for field in ("question", "option_a", "option_b", "option_c", "option_d", "correct")
+    })
+    attempts = (await session.exec(
+        select(*attempt_columns)
+        .join(MCQ, MCQ.id == UserMCQAttempt.mcq_id)
+        .where(UserMCQAttempt.user_id == current_user.id)
+        .where(UserMCQAttempt.chapter_id == chapter_id)
+        .order_by(UserMCQAttempt.id)
+    )).mappings().all()
+    reset_count = (await session.exec(
+        select(UserResetLog.reset_count)
+        .where(UserResetLog.user_id == current_user.id)
+        .where(UserResetLog.chapter_id == chapter_id)
+    )).first() or 0
+
+    body = {
+        "chapter_id": chapter_id,
+        "mcqs": [dict(row) for row in mcqs[:limit]],
+        "next_cursor": mcqs[limit - 1]["id"] if limit is not None and len(mcqs) > limit else None,
+        "mcq_count": len(mcqs) if limit is None else await cached_count(session, MCQ, chapter_id),
+        "attempts": [dict(row) for row in attempts],
+        "reset_count": reset_count,
+        "resets_remaining": MAX_RESETS - reset_count,
+        "flashcard_count": await cached_count(session, Flashcard, chapter_id),
+    }
+    return Response(orjson.dumps(body), media_type="application/json")
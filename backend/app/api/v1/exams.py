@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from jose import JWTError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import exams
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import create_exam_token, decode_exam_token
+from app.db import get_read_session, get_session
+from app.models.exam import ExamPaperResponse, ExamResult, ExamResultResponse, ExamSubmission
+from app.models.user import User
+
+router = APIRouter()
+
+SUBMIT_ATTEMPTS = 3  # gradings tried when a concurrent write collides with the answer sheet
+
+
+@router.post("/exams/{subject_id}/start", response_model=ExamPaperResponse)
+async def start_exam(
+    *,
+    read_session: AsyncSession = Depends(get_read_session),
+    session: AsyncSession = Depends(get_session),
+    subject_id: int,
+    current_user: User = Depends(get_current_user),
+):
+    """A full-subject mock exam in one response; the token carries the signed timer."""
+    paper_id = await exams.pick_paper(read_session, session, subject_id)
+    paper = await exams.load_paper(read_session, paper_id) if paper_id is not None else None
+    if paper is None or not paper.questions:
+        raise HTTPException(status_code=404, detail="No questions available for this subject")
+
+    # Whole seconds, so the start time round-trips through the token exactly
+    started_at = datetime.now(timezone.utc).replace(microsecond=0)
+    expires_at = started_at + timedelta(seconds=paper.duration_seconds)
+    body = {
+        "paper_id": paper.id,
+        "subject_id": paper.subject_id,
+        "duration_seconds": paper.duration_seconds,
+        "started_at": started_at,
+        "expires_at": expires_at,
+        "token": create_exam_token(current_user.id, paper.id, started_at, expires_at),
+        "questions": paper.questions,
+    }
+    return Response(orjson.dumps(body), media_type="application/json")
+
+
+@router.post("/exams/submit", response_model=ExamResultResponse)
+async def submit_exam(
+    *,
+    session: AsyncSession = Depends(get_session),
+    submission: ExamSubmission,
+    current_user: User = Depends(get_current_user),
+):
+    """Grade a whole answer sheet and record attempts, progress and the result together."""
+    try:
+        claims = decode_exam_token(submission.token)
+    except JWTError:
+        raise HTTPException(status_code=400, detail="Invalid exam token")
+    if claims.get("uid") != current_user.id:
+        raise HTTPException(status_code=403, detail="This exam was started by another user")
+    if datetime.now(timezone.utc).timestamp() > claims["end"] + settings.EXAM_SUBMIT_GRACE_SECONDS:
+        raise HTTPException(status_code=403, detail="Exam time is over")
+
+    started_at = datetime.fromtimestamp(claims["start"], timezone.utc)
+    if await _submitted(session, current_user.id, claims["paper"], started_at):
+        raise HTTPException(status_code=409, detail="This exam has already been submitted")
+    paper = await exams.load_paper(session, claims["paper"])
+    if paper is None:
+        raise HTTPException(status_code=404, detail="Exam paper not found")
+
+    for _ in range(SUBMIT_ATTEMPTS):
+        try:
+            # grade() flushes its attempts before reading progress, so a conflict can surface there too
+            result = await exams.grade(session, current_user.id, paper, started_at, submission.answers)
+            await session.commit()
+            return result
+        except IntegrityError:
+            await session.rollback()
+            if await _submitted(session, current_user.id, paper.id, started_at):
+                # A concurrent submission of the same exam won
+                raise HTTPException(status_code=409, detail="This exam has already been submitted")
+            # Otherwise a concurrent POST /attempts (or progress update) wrote a row this sheet also
+            # wrote; grading again keeps that first answer and records the rest.
+    raise HTTPException(status_code=409, detail="Answers changed while grading; please submit again")
+
+
+async def _submitted(session: AsyncSession, user_id: int, paper_id: int, started_at: datetime) -> bool:
+    return (await session.exec(
+        select(ExamResult.id)
+        .where(ExamResult.user_id == user_id)
+        .where(ExamResult.paper_id == paper_id)
+        .where(ExamResult.started_at == started_at)
+    )).first() is not None
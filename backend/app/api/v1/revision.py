@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Integer, cast
 from sqlalchemy.sql.expression import func
-from typing import List
-from datetime import datetime, timezone
-from app.db import get_session
+from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from app.db import get_session, get_read_session
 from app.api.deps import get_current_user
+from app.core.responses import json_rows, model_columns
 from app.models.progress import Progress, ProgressResponse
 from app.models.mcq import MCQ, MCQResponse
+from app.models.mcq_attempt import AttemptSummary, UserMCQAttempt
+from app.models.weekly_report import WeeklyReport, WeeklyReportResponse
+from app.reports import week_start_of
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -17,8 +23,8 @@ class ProgressUpdate(BaseModel):
     total_questions: int
 
 @router.post("/progress/update", response_model=ProgressResponse)
-def update_progress(*, session: Session = Depends(get_session), data: ProgressUpdate, current_user = Depends(get_current_user)):
-    progress = session.exec(select(Progress).where(Progress.user_id == current_user.id, Progress.chapter_id == data.chapter_id)).first()
+async def update_progress(*, session: AsyncSession = Depends(get_session), data: ProgressUpdate, current_user = Depends(get_current_user)):
+    progress = (await session.exec(select(Progress).where(Progress.user_id == current_user.id, Progress.chapter_id == data.chapter_id))).first()
     
     accuracy = (data.correct_answers / data.total_questions) * 100 if data.total_questions > 0 else 0.0
     
@@ -38,49 +44,73 @@ def update_progress(*, session: Session = Depends(get_session), data: ProgressUp
         progress.last_practiced = datetime.now(timezone.utc)
         session.add(progress)
         
-    session.commit()
-    session.refresh(progress)
+    await session.commit()
+    await session.refresh(progress)
     return progress
 
-@router.get("/daily", response_model=List[MCQResponse])
-def daily_revision(*, session: Session = Depends(get_session), current_user = Depends(get_current_user)):
-    """Return 10 random MCQs filtered to the user's selected class."""
+async def daily_mcqs(session: AsyncSession, class_id: Optional[int]):
+    """10 random MCQ rows from the class's chapters, or from anywhere if the class has none."""
     from app.models.chapter import Chapter
     from app.models.subject import Subject
 
-    if current_user.class_id:
+    if class_id:
         # Get all chapter IDs for the user's class
-        subjects = session.exec(select(Subject).where(Subject.class_id == current_user.class_id)).all()
+        subjects = (await session.exec(select(Subject).where(Subject.class_id == class_id))).all()
         subject_ids = [s.id for s in subjects]
         if subject_ids:
-            chapters = session.exec(select(Chapter).where(Chapter.subject_id.in_(subject_ids))).all()
+            chapters = (await session.exec(select(Chapter).where(Chapter.subject_id.in_(subject_ids)))).all()
             chapter_ids = [c.id for c in chapters]
             if chapter_ids:
-                mcqs = session.exec(
-                    select(MCQ)
+                mcqs = (await session.exec(
+                    select(*model_columns(MCQ, MCQResponse))
                     .where(MCQ.chapter_id.in_(chapter_ids))
                     .order_by(func.random())
                     .limit(10)
-                ).all()
+                )).mappings().all()
                 if mcqs:
                     return mcqs
 
     # Fallback: any 10 random MCQs from the DB
-    mcqs = session.exec(select(MCQ).order_by(func.random()).limit(10)).all()
-    return mcqs
+    return (await session.exec(select(*model_columns(MCQ, MCQResponse)).order_by(func.random()).limit(10))).mappings().all()
+
+@router.get("/daily", response_model=List[MCQResponse])
+async def daily_revision(*, session: AsyncSession = Depends(get_read_session), current_user = Depends(get_current_user)):
+    """Return 10 random MCQs filtered to the user's selected class."""
+    return json_rows(await daily_mcqs(session, current_user.class_id))
 
 class ProgressStatsResponse(BaseModel):
     accuracy: int
     completed_chapters: int
     total_quizzes: int
     streak: int
+    questions_answered: int = 0
+    questions_correct: int = 0
 
-@router.get("/progress/stats", response_model=ProgressStatsResponse)
-def get_progress_stats(*, session: Session = Depends(get_session), current_user = Depends(get_current_user)):
-    user_progress = session.exec(select(Progress).where(Progress.user_id == current_user.id)).all()
+
+async def answered_totals(session: AsyncSession, user_id: int):
+    """Lifetime (answered, correct) counts: compacted summaries plus recent attempts.
+
+    Both tables are summed in one statement, so the stats endpoint pays a single round trip for them.
+    """
+    archived = (
+        select(func.coalesce(func.sum(AttemptSummary.attempts), 0), func.coalesce(func.sum(AttemptSummary.correct), 0))
+        .where(AttemptSummary.user_id == user_id)
+    )
+    recent = (
+        select(func.count(), func.coalesce(func.sum(cast(UserMCQAttempt.is_correct, Integer)), 0))
+        .where(UserMCQAttempt.user_id == user_id)
+    )
+    rows = (await session.exec(archived.union_all(recent))).all()
+    return sum(row[0] for row in rows), sum(row[1] for row in rows)
+
+
+async def progress_stats(session: AsyncSession, user_id: int) -> ProgressStatsResponse:
+    user_progress = (await session.exec(select(Progress).where(Progress.user_id == user_id))).all()
     
+    answered, correct = await answered_totals(session, user_id)
     if not user_progress:
-        return ProgressStatsResponse(accuracy=0, completed_chapters=0, total_quizzes=0, streak=0)
+        return ProgressStatsResponse(accuracy=0, completed_chapters=0, total_quizzes=0, streak=0,
+                                     questions_answered=answered, questions_correct=correct)
         
     avg_accuracy = sum(p.accuracy for p in user_progress) / len(user_progress)
     completed_chapters = len(user_progress)
@@ -93,5 +123,27 @@ def get_progress_stats(*, session: Session = Depends(get_session), current_user
         accuracy=int(avg_accuracy),
         completed_chapters=completed_chapters,
         total_quizzes=total_quizzes,
-        streak=max_streak
+        streak=max_streak,
+        questions_answered=answered,
+        questions_correct=correct,
     )
+
+@router.get("/progress/stats", response_model=ProgressStatsResponse)
+async def get_progress_stats(*, session: AsyncSession = Depends(get_read_session), current_user = Depends(get_current_user)):
+    return await progress_stats(session, current_user.id)
+
+@router.get("/report/weekly", response_model=WeeklyReportResponse)
+async def get_weekly_report(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    week: Optional[date] = Query(None, description="Any day in the week; defaults to the last completed week"),
+    current_user = Depends(get_current_user),
+):
+    """The precomputed weekly summary written by the nightly report job."""
+    day = week or datetime.now(timezone.utc).date() - timedelta(days=7)
+    report = (await session.exec(
+        select(WeeklyReport).where(WeeklyReport.user_id == current_user.id, WeeklyReport.week_start == week_start_of(day))
+    )).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="No report for this week")
+    return WeeklyReportResponse(**report.model_dump(), user_type=current_user.user_type)
@@ -0,0 +1,49 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_read_session
+from app.api.deps import get_current_user
+from app.models.user import User
+from app import search as search_index
+
+router = APIRouter()
+
+MAX_OFFSET = 500
+
+
+class SearchHit(BaseModel):
+    kind: str  # "mcq" or "flashcard"
+    id: int
+    chapter_id: int
+    class_id: int
+    question: str
+    snippet: Optional[str] = None
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    next_offset: Optional[int] = None
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    q: str = Query(..., min_length=1, max_length=200),
+    class_id: Optional[int] = Query(None, description="Defaults to the user's class; 0 searches every class"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=MAX_OFFSET),
+    current_user: User = Depends(get_current_user),
+):
+    """Ranked full-text search over MCQs and flashcards."""
+    if class_id is None:
+        class_id = current_user.class_id
+    elif class_id == 0:
+        class_id = None
+    # One extra hit tells us whether there is another page
+    hits = await search_index.search(session, q, class_id, limit + 1, offset)
+    next_offset = offset + limit if len(hits) > limit and offset + limit <= MAX_OFFSET else None
+    return SearchResponse(query=q, results=hits[:limit], next_offset=next_offset)
@@ -0,0 +1,109 @@
+"""Attempt-history compaction.
+
+Attempts older than the retention window are folded into per-user,
+per-chapter totals in `attempt_summaries`, and the raw rows move to
+`user_mcq_attempts_archive`. The routers then only read recent rows from
+user_mcq_attempts. Each moved (user, question) pair is also kept in
+`answered_mcqs`, so a compacted question still counts as answered: it cannot
+be answered a second time, and lifetime stats stay exact as the summary
+totals plus whatever is still in the hot table.
+
+Users are processed in id ranges. Each range is archived, summarised and
+deleted in one transaction, so a crash or a concurrent run never counts a
+row twice or loses one. Archiving runs first so the range takes the write
+lock before it reads anything.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional, Set
+
+from sqlalchemy import Integer, bindparam, cast, delete, exists, func, literal, select, update
+from sqlalchemy.engine import Engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import AnsweredMCQ, AttemptSummary, User, UserMCQAttempt, UserMCQAttemptArchive
+
+USER_RANGE = 5000
+ARCHIVED_COLUMNS = ("id", "user_id", "chapter_id", "mcq_id", "selected_answer", "is_correct", "attempted_at")
+
+
+async def answered_mcq_ids(session: AsyncSession, user_id: int, mcq_ids: Iterable[int]) -> Set[int]:
+    """Which of `mcq_ids` the user has already answered, recently or before compaction."""
+    mcq_ids = list(mcq_ids)
+    if not mcq_ids:
+        return set()
+    recent = select(UserMCQAttempt.mcq_id).where(
+        UserMCQAttempt.user_id == user_id, UserMCQAttempt.mcq_id.in_(mcq_ids)
+    )
+    compacted = select(AnsweredMCQ.mcq_id).where(AnsweredMCQ.user_id == user_id, AnsweredMCQ.mcq_id.in_(mcq_ids))
+    return {row[0] for row in (await session.exec(recent.union(compacted))).all()}
+
+
+def compact_attempts(engine: Engine, cutoff: datetime, user_range: int = USER_RANGE,
+                     progress: Optional[Callable[[str], None]] = print) -> int:
+    """Archive and summarise every attempt made before `cutoff`; returns the number of rows moved."""
+    attempts_t, archive_t, answered_t = UserMCQAttempt.__table__, UserMCQAttemptArchive.__table__, AnsweredMCQ.__table__
+    summaries_t, users_t = AttemptSummary.__table__, User.__table__
+    started = time.perf_counter()
+    archived_at = datetime.now(timezone.utc)
+
+    with engine.connect() as conn:
+        max_user_id = conn.execute(select(func.max(users_t.c.id))).scalar() or 0
+
+    moved = 0
+    for low in range(1, max_user_id + 1, user_range):
+        high = low + user_range - 1
+        old = (attempts_t.c.user_id.between(low, high), attempts_t.c.attempted_at < cutoff)
+        with engine.begin() as conn:
+            archived = conn.execute(archive_t.insert().from_select(
+                [*ARCHIVED_COLUMNS, "archived_at"],
+                select(*(attempts_t.c[name] for name in ARCHIVED_COLUMNS),
+                       literal(archived_at, type_=archive_t.c.archived_at.type)).where(*old),
+            )).rowcount
+            if not archived:
+                continue
+            conn.execute(answered_t.insert().from_select(
+                ["user_id", "mcq_id", "chapter_id"],
+                select(attempts_t.c.user_id, attempts_t.c.mcq_id, attempts_t.c.chapter_id).where(*old).where(
+                    ~exists().where(answered_t.c.user_id == attempts_t.c.user_id,
+                                    answered_t.c.mcq_id == attempts_t.c.mcq_id)
+                ),
+            ))
+
+            existing = {
+                (row.user_id, row.chapter_id): row
+                for row in conn.execute(
+                    select(summaries_t).where(summaries_t.c.user_id.between(low, high))
+                )
+            }
+            inserts, updates = [], []
+            for user_id, chapter_id, n, n_correct, last_attempt_at in conn.execute(
+                select(
+                    attempts_t.c.user_id, attempts_t.c.chapter_id, func.count(),
+                    func.sum(cast(attempts_t.c.is_correct, Integer)), func.max(attempts_t.c.attempted_at),
+                )
+                .where(*old)
+                .group_by(attempts_t.c.user_id, attempts_t.c.chapter_id)
+            ):
+                summary = existing.get((user_id, chapter_id))
+                if summary is None:
+                    inserts.append({"user_id": user_id, "chapter_id": chapter_id, "attempts": n,
+                                    "correct": n_correct or 0, "last_attempt_at": last_attempt_at})
+                else:
+                    updates.append({"summary_id": summary.id, "attempts": summary.attempts + n,
+                                    "correct": summary.correct + (n_correct or 0),
+                                    "last_attempt_at": max(summary.last_attempt_at, last_attempt_at)})
+            if inserts:
+                conn.execute(summaries_t.insert(), inserts)
+            if updates:
+                conn.execute(
+                    update(summaries_t).where(summaries_t.c.id == bindparam("summary_id")),
+                    updates,
+                )
+            conn.execute(delete(attempts_t).where(*old))
+
+        moved += archived
+        if progress:
+            progress(f"  users {low:>10,}-{high:<10,} {moved:>12,} attempts archived  "
+                     f"{time.perf_counter() - started:>8.1f}s")
+    return moved
@@ -0,0 +1,66 @@
+"""Admission control for slow, expensive work such as AI generation.
+
+A gate lets `limit` callers run at once and up to `queue_size` more wait,
+each for at most `queue_timeout` seconds. Anyone beyond that, or whose wait
+runs out, gets `Overloaded` straight away. A burst of slow calls therefore
+cannot pile up on the event loop, the connection pools or the provider,
+and the client is told when to retry instead of hanging.
+
+Like the metrics, gate state is only touched from the event loop, so no
+locking is needed beyond the semaphore.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from app.core import metrics
+
+
+class Overloaded(Exception):
+    """The gate is at capacity; retry after `retry_after` seconds."""
+
+    def __init__(self, gate: str, reason: str, retry_after: int):
+        super().__init__(f"{gate} is over capacity ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.queued = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        metrics.track_gate(self)
+
+    def _reject(self, reason: str):
+        metrics.ADMISSION_REJECTED.inc(self.name, reason)
+        return Overloaded(self.name, reason, self.retry_after)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot for the duration of the block, or raise Overloaded."""
+        if self._semaphore.locked():
+            if self.queued >= self.queue_size:
+                raise self._reject("queue_full")
+            self.queued += 1
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("queue_timeout") from None
+            finally:
+                self.queued -= 1
+                metrics.ADMISSION_WAIT.observe(time.perf_counter() - started, self.name)
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
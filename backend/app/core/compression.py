@@ -0,0 +1,136 @@
+"""Response compression negotiated from Accept-Encoding.
+
+Brotli is used when the `brotli` package is installed and the client accepts
+it; gzip otherwise. Bodies with a text-like content type are buffered until
+they reach COMPRESSION_MINIMUM_SIZE bytes; smaller responses go out as they
+are, since compressing them is not worth the CPU. Larger ones, streamed or
+not, are compressed incrementally.
+"""
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def negotiate(header: str) -> Optional[str]:
+    """Pick "br" or "gzip" for an Accept-Encoding header, or None for identity."""
+    codings = _accepted(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with the negotiated coding."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compressor(self, coding: str):
+        if coding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    @staticmethod
+    def finish(compressor, coding: str, body: bytes) -> bytes:
+        if coding == "br":
+            return compressor.process(body) + compressor.finish()
+        return compressor.compress(body) + compressor.flush()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        buffered = []
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                compressible = (
+                    headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                    and "content-encoding" not in headers
+                )
+                if not compressible:
+                    await send(message)
+                    return
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or (start_message is None and compressor is None):
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                buffered.append(body)
+                size = sum(len(chunk) for chunk in buffered)
+                if size < self.minimum_size:
+                    if more_body:
+                        return
+                    # Finished below the threshold: send it as it is
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(buffered)})
+                    return
+                body = b"".join(buffered)
+                compressor = self.compressor(coding)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = coding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    # The whole body is here: compress it in one go and keep a Content-Length
+                    body = self.finish(compressor, coding, body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            data = self.finish(compressor, coding, body) if not more_body else (
+                compressor.process(body) if coding == "br" else compressor.compress(body)
+            )
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
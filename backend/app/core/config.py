@@ -7,6 +7,19 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     GEMINI_API_KEY: Optional[str] = None
     OPENROUTER_API_KEY: Optional[str] = None
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    OPENROUTER_MODEL: str = "google/gemma-3-4b-it:free"  # Confirmed working free-tier model
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    GEMINI_MODEL: str = "gemini-2.0-flash"
+
+    # AI provider routing (app/core/llm.py): providers in priority order, a
+    # hedged request to the next one when no first token arrives in time, and
+    # a circuit breaker per provider
+    AI_PROVIDERS: str = "openrouter,gemini"
+    AI_HEDGE_AFTER_SECONDS: float = 3.0
+    AI_PROVIDER_TIMEOUT_SECONDS: float = 60.0
+    AI_BREAKER_FAILURES: int = 5
+    AI_BREAKER_COOLDOWN_SECONDS: float = 30.0
     SMTP_EMAIL: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
     
@@ -16,6 +29,69 @@ class Settings(BaseSettings):
 
     # For local development we'll use sqlite
     DATABASE_URL: str = "sqlite:///./ncert_revision.db"
+    SQL_ECHO: bool = False
+    # Upgrade the schema on startup when it is behind. Deployments that run
+    # `alembic upgrade head` before starting workers turn this off.
+    AUTO_MIGRATE: bool = True
+
+    # SQLite performance profile: WAL journaling, relaxed fsync and a separate
+    # read pool so readers never queue behind the single writer connection.
+    SQLITE_TUNED: bool = True
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE_KB: int = 32 * 1024  # per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Debug mode exposes per-request query stats as X-DB-* response headers
+    DEBUG: bool = False
+    QUERY_STATS_ENABLED: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5  # same statement shape this many times in one request
+
+    # Keyset pagination for per-chapter question and flashcard lists
+    PAGE_SIZE_DEFAULT: int = 100  # when `after_id` is sent without `limit`; no paging params means no paging
+    PAGE_SIZE_MAX: int = 500
+    COUNT_CACHE_TTL_SECONDS: float = 300
+
+    # Response compression (br when the brotli package is installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # compact_attempts.py folds raw MCQ attempts older than this into
+    # attempt_summaries and moves them to user_mcq_attempts_archive
+    ATTEMPT_RETENTION_DAYS: int = 180
+
+    # Mock exams: papers are built lazily per subject and reused
+    EXAM_QUESTIONS_PER_PAPER: int = 30
+    EXAM_PAPERS_PER_SUBJECT: int = 5
+    EXAM_SECONDS_PER_QUESTION: int = 60
+    EXAM_SUBMIT_GRACE_SECONDS: int = 30  # late answer sheets within this are still graded
+
+    # Write requests carrying an Idempotency-Key get their response stored and
+    # replayed on retries instead of running twice
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_LOCK_SECONDS: int = 120  # a claim older than this with no response is abandoned
+
+    # Admission control for AI generation: calls beyond the limit queue briefly,
+    # then get 503 with Retry-After
+    AI_MAX_CONCURRENCY: int = 4
+    AI_QUEUE_SIZE: int = 8
+    AI_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    AI_RETRY_AFTER_SECONDS: int = 10
+
+    # Prometheus-style metrics on /metrics
+    METRICS_ENABLED: bool = True
+
+    # Request profiling: X-Profile: 1 plus a valid X-Admin-Key, or a random
+    # fraction of requests. Off means the middleware is not installed.
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 2.0
+
+    # Admin endpoints are disabled unless a key is configured (sent as X-Admin-Key)
+    ADMIN_API_KEY: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,69 @@
+from app.core.config import settings
+
+
+def send_otp_email(email: str, otp: str) -> str:
+    """Send OTP verification code via Gmail SMTP.
+
+    Returns the outcome: "sent", "failed", or "console" when SMTP is not configured.
+    """
+    # Imported here so app startup doesn't pay for the SMTP/MIME stack
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
+    smtp_email = getattr(settings, 'SMTP_EMAIL', None)
+    smtp_password = getattr(settings, 'SMTP_PASSWORD', None)
+
+    # Fallback if email not configured
+    if not smtp_email or not smtp_password:
+        print(f"\n{'='*40}\n📧 EMAIL SENT TO: {email}\n🔑 YOUR OTP CODE IS: {otp}\n{'='*40}\n")
+        return "console"
+
+    try:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = "🔐 Your NCERT Revision Login OTP"
+        msg["From"] = smtp_email
+        msg["To"] = email
+
+        html_body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; background-color: #f8fafc; padding: 30px;">
+            <div style="max-width: 480px; margin: 0 auto; background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
+                <div style="text-align: center; margin-bottom: 24px;">
+                    <h1 style="color: #22c55e; margin: 0; font-size: 28px;">📚 NCERT Revision</h1>
+                    <p style="color: #6b7280; margin-top: 8px;">Your One-Time Verification Code</p>
+                </div>
+                <div style="text-align: center; background: #f0fdf4; border-radius: 12px; padding: 24px; margin: 20px 0;">
+                    <p style="color: #6b7280; font-size: 14px; margin: 0 0 8px 0;">Your OTP Code is:</p>
+                    <h2 style="color: #111827; font-size: 36px; letter-spacing: 8px; margin: 0; font-weight: 800;">{otp}</h2>
+                </div>
+                <p style="color: #6b7280; font-size: 13px; text-align: center;">
+                    This code will expire in <strong>5 minutes</strong>.<br/>
+                    If you didn't request this, please ignore this email.
+                </p>
+                <hr style="border: none; border-top: 1px solid #e5e7eb; margin: 24px 0;" />
+                <p style="color: #9ca3af; font-size: 11px; text-align: center;">
+                    NCERT Smart Revision App • Made with ❤️ for Students
+                </p>
+            </div>
+        </body>
+        </html>
+        """
+
+        msg.attach(MIMEText(html_body, "html"))
+
+        # ✅ Gmail SMTP
+        with smtplib.SMTP("smtp.gmail.com", 587) as server:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(smtp_email, smtp_password)
+            server.sendmail(smtp_email, email, msg.as_string())
+
+        print(f"✅ OTP email sent successfully to {email}")
+        return "sent"
+
+    except Exception as e:
+        print(f"❌ Failed to send OTP email: {e}")
+        print(f"🔑 Fallback — OTP for {email}: {otp}")
+        return "failed"
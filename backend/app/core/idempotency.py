@@ -0,0 +1,188 @@
+"""Idempotency-Key support for write requests.
+
+A client that may retry a POST/PUT/PATCH/DELETE sends a unique
+Idempotency-Key header. The first request with a key claims it in the
+`idempotency_keys` table, runs normally, and its response is stored for
+IDEMPOTENCY_TTL_SECONDS. A retry with the same key gets the stored response
+back, marked with Idempotent-Replayed: true, without running the handler
+again. A retry that arrives while the first request is still running gets
+409, and reusing a key for a different request gets 422.
+
+Only the routes the middleware is given are covered: the retried writes,
+never auth endpoints, whose responses carry bearer tokens that must not sit
+in a table. Keys are scoped to the caller's Authorization header. 5xx and 429 responses
+are not stored, so those requests can be retried for real. A claim whose
+request never finished (the worker died) is taken over after
+IDEMPOTENCY_LOCK_SECONDS.
+"""
+import hashlib
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app.models.idempotency import IdempotencyKey
+
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 1024 * 1024  # bytes; larger responses are not replayable
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def route_pattern(template: str) -> "re.Pattern":
+    """Regex matching a route template such as /ai/generate-mcq/{chapter_id}."""
+    parts = re.split(r"\{[^}]+\}", template)
+    return re.compile("^" + "[^/]+".join(re.escape(part) for part in parts) + "$")
+
+
+def _sha256(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotencyMiddleware:
+    """Pure ASGI middleware replaying stored responses for repeated Idempotency-Keys."""
+
+    def __init__(self, app, engine, paths: Iterable[str], ttl_seconds: float = 86400, lock_seconds: float = 120):
+        self.app = app
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.paths = [route_pattern(path) for path in paths]
+        self.table = IdempotencyKey.__table__
+        self._next_purge = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS
+                or not any(pattern.match(scope["path"]) for pattern in self.paths)):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"}, 400)
+            await response(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        caller = _sha256(headers.get("authorization", "").encode())
+        request_hash = _sha256(scope["method"].encode(), scope["path"].encode(), scope["query_string"], body)
+        stored = await self.claim(caller, key, request_hash)
+        if stored is not None:
+            await self.replay(stored, request_hash, scope, receive, send)
+            return
+
+        replayed_body = False
+
+        async def receive_body():
+            nonlocal replayed_body
+            if not replayed_body:
+                replayed_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = None
+        response_headers = []
+        parts = []
+        size = 0
+
+        async def capture(message):
+            nonlocal status, response_headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = [[name.decode("latin-1"), value.decode("latin-1")]
+                                    for name, value in message["headers"]]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= MAX_STORED_BODY:
+                    parts.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            await self.release(caller, key)
+            raise
+        if status is None or status >= 500 or status == 429 or size > MAX_STORED_BODY:
+            await self.release(caller, key)
+        else:
+            await self.store(caller, key, status, response_headers, b"".join(parts))
+
+    async def claim(self, caller: str, key: str, request_hash: str):
+        """Claim `key` for this request; returns the existing row instead if someone else holds it."""
+        now = datetime.now(timezone.utc)
+        pending = {"request_hash": request_hash, "status_code": None, "headers": [], "body": b"",
+                   "created_at": now, "expires_at": now + self.ttl}
+        table = self.table
+        try:
+            async with self.engine.begin() as conn:
+                row = (await conn.execute(
+                    select(table).where(table.c.scope == caller, table.c.key == key)
+                )).first()
+                if row is None:
+                    await conn.execute(table.insert().values(scope=caller, key=key, **pending))
+                    return None
+                abandoned = row.status_code is None and row.created_at <= now - self.lock
+                if row.expires_at > now and not abandoned:
+                    return dict(row._mapping)
+                # Expired or abandoned: take it over, unless another request just did
+                taken = await conn.execute(
+                    update(table)
+                    .where(table.c.id == row.id, table.c.created_at == row.created_at)
+                    .values(**pending)
+                )
+                return None if taken.rowcount else dict(row._mapping)
+        except IntegrityError:
+            # Another request inserted the same key first; it is still running
+            return {"request_hash": request_hash, "status_code": None}
+
+    async def replay(self, stored: dict, request_hash: str, scope, receive, send):
+        if stored["request_hash"] != request_hash:
+            response = JSONResponse({"detail": "Idempotency-Key was already used for a different request"}, 422)
+        elif stored["status_code"] is None:
+            response = JSONResponse({"detail": "A request with this Idempotency-Key is still being processed"}, 409)
+        else:
+            headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored["headers"]]
+            headers.append((b"idempotent-replayed", b"true"))
+            await send({"type": "http.response.start", "status": stored["status_code"], "headers": headers})
+            await send({"type": "http.response.body", "body": stored["body"]})
+            return
+        await response(scope, receive, send)
+
+    async def store(self, caller: str, key: str, status: int, headers, body: bytes):
+        now = datetime.now(timezone.utc)
+        table = self.table
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                update(table)
+                .where(table.c.scope == caller, table.c.key == key)
+                .values(status_code=status, headers=headers, body=body, expires_at=now + self.ttl)
+            )
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                await conn.execute(delete(table).where(table.c.expires_at <= now))
+
+    async def release(self, caller: str, key: str):
+        table = self.table
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(table).where(table.c.scope == caller, table.c.key == key))
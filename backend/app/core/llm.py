@@ -0,0 +1,343 @@
+"""LLM provider routing with hedged requests and circuit breakers.
+
+Providers are tried in priority order (AI_PROVIDERS), and every call streams
+its response. If no provider has produced a first token after
+AI_HEDGE_AFTER_SECONDS, the next provider gets the same prompt as a hedge.
+The first complete response that passes the caller's `validate` check wins,
+and the losing request is cancelled, which closes its connection. When an
+attempt fails outright, the next provider is tried immediately.
+
+Each provider keeps an exponentially weighted average of its time to first
+token. A provider whose average is above the hedge threshold is demoted
+behind the others until it recovers. A circuit breaker takes a provider out
+of rotation after AI_BREAKER_FAILURES consecutive failures. After
+AI_BREAKER_COOLDOWN_SECONDS it is let back in for one trial call, which
+decides whether it stays.
+
+Like the metrics, all state is only touched from the event loop.
+"""
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+EWMA_ALPHA = 0.2
+
+
+class AIProviderError(Exception):
+    """The AI provider answered with an HTTP error status."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class ProvidersUnavailable(Exception):
+    """Every configured provider is switched off by its circuit breaker."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("no AI provider is available")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self.trial_running)
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_running = False
+
+
+class Provider(ABC):
+    """One streaming chat-completion backend."""
+
+    name = "provider"
+
+    def __init__(self, api_key: str, base_url: str, model: str, timeout: float, breaker: CircuitBreaker):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.breaker = breaker
+        self.ttft_ewma: Optional[float] = None  # seconds to first token
+        self._client = None
+
+    def record_first_token(self, seconds: float):
+        metrics.AI_FIRST_TOKEN.observe(seconds, self.name)
+        self._update_ttft(seconds)
+
+    def record_no_first_token(self, waited: float):
+        """A call cancelled before its first token, which would have taken at least `waited`.
+
+        Without this a provider that always loses the hedge race never records
+        a sample and is never demoted. Only a wait longer than the average
+        says anything, so shorter ones are ignored.
+        """
+        if self.ttft_ewma is None or waited > self.ttft_ewma:
+            self._update_ttft(waited)
+
+    def _update_ttft(self, seconds: float):
+        self.ttft_ewma = seconds if self.ttft_ewma is None else (
+            EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.ttft_ewma
+        )
+
+    @abstractmethod
+    def request(self, prompt: str) -> dict:
+        """Keyword arguments for httpx's `client.stream`."""
+
+    @abstractmethod
+    def chunk_text(self, event: dict) -> str:
+        """The text carried by one server-sent event."""
+
+    def client(self):
+        """One pooled client per provider, so calls reuse TLS connections instead of handshaking each time."""
+        if self._client is None:
+            # httpx is only needed once AI is actually used; keep it off the startup path
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks from the provider's server-sent events."""
+        async with self.client().stream(**self.request(prompt)) as response:
+            if response.is_error:
+                await response.aread()
+                raise AIProviderError(response.status_code, response.text)
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                text = self.chunk_text(json.loads(data))
+                if text:
+                    yield text
+
+
+class OpenRouterProvider(Provider):
+    name = "openrouter"
+
+    def request(self, prompt: str) -> dict:
+        return {
+            "method": "POST",
+            "url": f"{self.base_url}/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "HTTP-Referer": "https://ncertrevision.app",  # Optional: shown in OpenRouter dashboard
+                "X-Title": "NCERT Smart Revision",            # Optional: shown in OpenRouter dashboard
+            },
+            "json": {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.7,
+                "max_tokens": 2048,
+                "stream": True,
+            },
+        }
+
+    def chunk_text(self, event: dict) -> str:
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+
+class GeminiProvider(Provider):
+    name = "gemini"
+
+    def request(self, prompt: str) -> dict:
+        return {
+            "method": "POST",
+            "url": f"{self.base_url}/models/{self.model}:streamGenerateContent",
+            "params": {"alt": "sse"},
+            "headers": {"x-goog-api-key": self.api_key, "Content-Type": "application/json"},
+            "json": {
+                "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                "generationConfig": {"temperature": 0.7, "maxOutputTokens": 2048},
+            },
+        }
+
+    def chunk_text(self, event: dict) -> str:
+        candidates = event.get("candidates") or [{}]
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+
+class ProviderRouter:
+    def __init__(self, providers: List[Provider], hedge_after: float):
+        self.providers = providers
+        self.hedge_after = hedge_after
+
+    async def aclose(self):
+        for provider in self.providers:
+            await provider.aclose()
+
+    def candidates(self) -> List[Provider]:
+        """Providers the breaker lets through, slow ones (by first-token average) last."""
+        available = [provider for provider in self.providers if provider.breaker.allow()]
+        return sorted(
+            available,
+            key=lambda provider: provider.ttft_ewma is not None and provider.ttft_ewma > self.hedge_after,
+        )
+
+    async def _attempt(self, provider: Provider, prompt: str, validate, first_token: asyncio.Event) -> str:
+        import httpx
+
+        started = time.perf_counter()
+        outcome = "error"
+        chunks = []
+        try:
+            async for chunk in provider.stream(prompt):
+                if not chunks:
+                    provider.record_first_token(time.perf_counter() - started)
+                    first_token.set()
+                chunks.append(chunk)
+            text = "".join(chunks)
+            try:
+                if not text.strip():
+                    raise ValueError("empty response")
+                if validate is not None:
+                    validate(text)
+            except ValueError:
+                # A bad answer is not an outage: no breaker failure
+                outcome = "invalid"
+                provider.breaker.record_success()
+                raise
+            outcome = "ok"
+            provider.breaker.record_success()
+            return text
+        except asyncio.CancelledError:
+            # Lost the race or the client went away: not a failure, but a slow first token still counts
+            outcome = "cancelled"
+            provider.breaker.trial_running = False
+            if not chunks:
+                provider.record_no_first_token(time.perf_counter() - started)
+            raise
+        except Exception as error:
+            if outcome != "invalid":
+                if isinstance(error, AIProviderError):
+                    outcome = f"http_{error.status_code}"
+                elif isinstance(error, httpx.TimeoutException):
+                    outcome = "timeout"
+                provider.breaker.record_failure()
+            raise
+        finally:
+            metrics.AI_DURATION.observe(time.perf_counter() - started, provider.name, outcome)
+
+    async def complete(self, prompt: str, validate: Optional[Callable[[str], object]] = None) -> str:
+        """The first valid completion from any provider; raises the last error if all of them fail."""
+        queue = self.candidates()
+        if not queue:
+            retry_after = min((provider.breaker.retry_after() for provider in self.providers), default=0.0)
+            raise ProvidersUnavailable(max(1, int(retry_after + 0.999)))
+
+        first_token = asyncio.Event()
+        attempts: Dict[asyncio.Task, Provider] = {}
+        last_error: Optional[BaseException] = None
+        loop = asyncio.get_running_loop()
+
+        def launch():
+            provider = queue.pop(0)
+            if provider.breaker.state == CircuitBreaker.HALF_OPEN:
+                provider.breaker.trial_running = True
+            attempts[asyncio.create_task(self._attempt(provider, prompt, validate, first_token))] = provider
+            return loop.time() + self.hedge_after
+
+        hedge_at = launch()
+        token_waiter = asyncio.create_task(first_token.wait())
+        try:
+            while attempts:
+                may_hedge = bool(queue) and not first_token.is_set()
+                waiting = set(attempts) | ({token_waiter} if may_hedge else set())
+                done, _ = await asyncio.wait(
+                    waiting,
+                    timeout=max(0.0, hedge_at - loop.time()) if may_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task is token_waiter:
+                        continue
+                    attempts.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if queue and not attempts:
+                    metrics.AI_HEDGES.inc(queue[0].name, "failover")
+                    hedge_at = launch()
+                elif queue and not first_token.is_set() and loop.time() >= hedge_at:
+                    metrics.AI_HEDGES.inc(queue[0].name, "slow")
+                    hedge_at = launch()
+            raise last_error
+        finally:
+            token_waiter.cancel()
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(token_waiter, *attempts, return_exceptions=True)
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(settings.AI_BREAKER_FAILURES, settings.AI_BREAKER_COOLDOWN_SECONDS)
+
+
+def build_router() -> ProviderRouter:
+    """Providers from AI_PROVIDERS, in that order, skipping any without an API key."""
+    available = {
+        "openrouter": lambda: settings.OPENROUTER_API_KEY and OpenRouterProvider(
+            settings.OPENROUTER_API_KEY, settings.OPENROUTER_BASE_URL, settings.OPENROUTER_MODEL,
+            settings.AI_PROVIDER_TIMEOUT_SECONDS, _breaker(),
+        ),
+        "gemini": lambda: settings.GEMINI_API_KEY and GeminiProvider(
+            settings.GEMINI_API_KEY, settings.GEMINI_BASE_URL, settings.GEMINI_MODEL,
+            settings.AI_PROVIDER_TIMEOUT_SECONDS, _breaker(),
+        ),
+    }
+    providers = []
+    for name in settings.AI_PROVIDERS.split(","):
+        factory = available.get(name.strip())
+        provider = factory() if factory else None
+        if provider:
+            providers.append(provider)
+    router = ProviderRouter(providers, settings.AI_HEDGE_AFTER_SECONDS)
+    metrics.track_providers(router.providers)
+    return router
@@ -0,0 +1,275 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Metrics are only ever updated from the event loop thread (blocking work such as
+sending email is timed by the coroutine awaiting it), so updates are plain
+dict operations with no locking. A request costs a few dictionary updates and
+a bisect into the histogram buckets.
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.routes import route_template
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_CALL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    @abstractmethod
+    def samples(self):
+        """(suffix, rendered labels, value) for every series of this metric."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield "", _format_labels(self.labelnames, labels), value
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, set directly or read from `collect` at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(),
+                 collect: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self.collect = collect
+
+    def inc(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, *labels, value: float):
+        self._values[labels] = value
+
+    def samples(self):
+        values = dict(self._values)
+        if self.collect is not None:
+            values.update(self.collect())
+        for labels, value in sorted(values.items()):
+            yield "", _format_labels(self.labelnames, labels), value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = 'le="' + _format_value(bound) + '"'
+                yield "_bucket", _format_labels(self.labelnames, labels, le), cumulative
+            yield "_sum", _format_labels(self.labelnames, labels), total
+            yield "_count", _format_labels(self.labelnames, labels), count
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ─── Application metrics ──────────────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"),
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method",),
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and status.",
+    ("method", "route", "status"),
+)
+AI_DURATION = Histogram(
+    "ai_request_duration_seconds", "AI provider call latency by outcome.", ("provider", "outcome"),
+    buckets=SLOW_CALL_BUCKETS,
+)
+AI_FIRST_TOKEN = Histogram(
+    "ai_first_token_seconds", "Time to the first streamed token by AI provider.", ("provider",),
+    buckets=SLOW_CALL_BUCKETS,
+)
+AI_HEDGES = Counter(
+    "ai_hedged_requests_total", "Extra AI provider requests: hedges for slow first tokens and failovers.",
+    ("provider", "reason"),
+)
+EMAIL_DURATION = Histogram(
+    "email_send_duration_seconds", "OTP email delivery latency by outcome.", ("outcome",),
+    buckets=SLOW_CALL_BUCKETS,
+)
+
+_pools: Dict[str, object] = {}
+
+
+def _collect_pools() -> Dict[Tuple, float]:
+    values = {}
+    for name, pool in _pools.items():
+        # Only queue pools report utilisation; static/singleton pools are skipped
+        if not hasattr(pool, "checkedout"):
+            continue
+        values[(name, "size")] = pool.size()
+        values[(name, "checked_out")] = pool.checkedout()
+        values[(name, "idle")] = pool.checkedin()
+        values[(name, "overflow")] = max(pool.overflow(), 0)
+    return values
+
+
+DB_POOL = Gauge(
+    "db_pool_connections", "Database connection pool utilisation.", ("pool", "state"), collect=_collect_pools,
+)
+
+
+def track_pool(name: str, pool):
+    """Report `pool`'s utilisation under db_pool_connections{pool=name}."""
+    _pools[name] = pool
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, in-flight requests and latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec(method)
+            route = route_template(scope)
+            code = str(status)
+            HTTP_REQUESTS.inc(method, route, code)
+            HTTP_DURATION.observe(elapsed, method, route, code)
+
+
+_gates: Dict[str, object] = {}
+
+
+def _collect_gates() -> Dict[Tuple, float]:
+    values = {}
+    for name, gate in _gates.items():
+        values[(name, "in_flight")] = gate.in_flight
+        values[(name, "queued")] = gate.queued
+        values[(name, "limit")] = gate.limit
+    return values
+
+
+ADMISSION = Gauge(
+    "admission_gate_slots", "Admission gate occupancy: in flight, queued and the concurrency limit.",
+    ("gate", "state"), collect=_collect_gates,
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejections_total", "Requests shed by an admission gate, by reason.", ("gate", "reason"),
+)
+ADMISSION_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time spent queued for an admission gate slot.", ("gate",),
+)
+
+
+def track_gate(gate):
+    """Report an AdmissionGate's occupancy under admission_gate_slots{gate=gate.name}."""
+    _gates[gate.name] = gate
+
+
+_providers: List[object] = []
+
+
+def _collect_providers() -> Dict[Tuple, float]:
+    values = {}
+    for provider in _providers:
+        values[(provider.name, "breaker_open")] = float(provider.breaker.state != "closed")
+        if provider.ttft_ewma is not None:
+            values[(provider.name, "first_token_ewma_seconds")] = provider.ttft_ewma
+    return values
+
+
+AI_PROVIDERS = Gauge(
+    "ai_provider_state", "AI provider health: circuit breaker state and average time to first token.",
+    ("provider", "stat"), collect=_collect_providers,
+)
+
+
+def track_providers(providers):
+    """Report the routed AI providers' breaker state and first-token average."""
+    _providers[:] = providers
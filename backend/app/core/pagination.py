@@ -0,0 +1,99 @@
+"""Keyset pagination for per-chapter lists.
+
+Pages are ordered by `id` and continue from the last id the client saw
+(`after_id`), so every page is an index range scan no matter how deep the
+client has paged. The body stays a plain JSON array; the cursor for the next
+page and the total are sent as X-Next-Cursor and X-Total-Count headers.
+Paging is opt-in: a request without `limit` or `after_id` gets the whole
+list, as clients written before pagination expect.
+
+Totals come from a small in-process cache with a TTL instead of a COUNT(*)
+per page. Writers that add rows through the API call `invalidate_count`;
+bulk imports from other processes are picked up when the entry expires.
+"""
+import time
+from typing import Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.responses import json_rows
+
+_counts: Dict[Tuple[str, int], Tuple[float, int]] = {}
+
+
+class PageParams:
+    """Query parameters shared by the paginated list endpoints."""
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(None, ge=0, description="Return rows with an id greater than this cursor"),
+        limit: Optional[int] = Query(None, ge=1, description="Page size (capped at PAGE_SIZE_MAX)"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return; id is always included"),
+    ):
+        self.after_id = after_id
+        if limit is None and after_id is None:
+            self.limit = None  # unpaginated
+        else:
+            self.limit = min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+        self.fields = fields
+
+
+def select_fields(response_model: Type[BaseModel], fields: Optional[str]) -> List[str]:
+    """Validate a `fields` projection against the response model, keeping model order."""
+    available = list(response_model.model_fields)
+    if not fields:
+        return available
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(available)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return [name for name in available if name in requested]
+
+
+async def cached_count(session: AsyncSession, table_model, chapter_id: int) -> int:
+    key = (table_model.__tablename__, chapter_id)
+    cached = _counts.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    total = (await session.exec(
+        select(func.count()).select_from(table_model).where(table_model.chapter_id == chapter_id)
+    )).one()
+    _counts[key] = (now + settings.COUNT_CACHE_TTL_SECONDS, total)
+    return total
+
+
+def invalidate_count(table_model, chapter_id: int):
+    _counts.pop((table_model.__tablename__, chapter_id), None)
+
+
+async def chapter_page(session: AsyncSession, table_model, response_model: Type[BaseModel],
+                       chapter_id: int, page: PageParams):
+    """One page of `table_model` rows for a chapter as a JSON response with cursor headers.
+
+    With no page size requested, every row is returned and there is no cursor.
+    """
+    columns = [getattr(table_model, name) for name in select_fields(response_model, page.fields)]
+    query = select(*columns).where(table_model.chapter_id == chapter_id)
+    if page.after_id is not None:
+        query = query.where(table_model.id > page.after_id)
+    query = query.order_by(table_model.id)
+    if page.limit is None:
+        rows = (await session.exec(query)).mappings().all()
+        response = json_rows(rows)
+        response.headers["X-Total-Count"] = str(len(rows))
+        return response
+    # One extra row tells us whether there is a next page without another query
+    rows = (await session.exec(query.limit(page.limit + 1))).mappings().all()
+
+    response = json_rows(rows[:page.limit])
+    if len(rows) > page.limit:
+        response.headers["X-Next-Cursor"] = str(rows[page.limit - 1]["id"])
+    response.headers["X-Total-Count"] = str(await cached_count(session, table_model, chapter_id))
+    return response
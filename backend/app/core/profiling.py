@@ -0,0 +1,178 @@
+"""Opt-in statistical profiling of individual requests.
+
+A profiled request gets a sampler thread that looks at the request's asyncio
+task every PROFILE_INTERVAL_MS. While the task is running, the event loop
+thread's live stack is recorded; while it is suspended, its chain of awaiting
+coroutines is recorded under a "(waiting)" frame, so time spent waiting on the
+database or a threadpool call (bcrypt, SMTP) shows up where it was awaited.
+
+Samples are aggregated per route template as collapsed stacks
+("frame;frame;frame count"), the input format of flamegraph.pl and speedscope.
+
+Requests are profiled when they carry `X-Profile: 1` together with a valid
+`X-Admin-Key`, or at random with probability PROFILE_SAMPLE_RATE. With
+PROFILING_ENABLED off the middleware is not installed at all.
+"""
+import asyncio
+import random
+import sys
+import sysconfig
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.routes import route_template
+
+MAX_STACKS_PER_ROUTE = 5000
+
+_BACKEND_DIR = str(Path(__file__).resolve().parent.parent.parent) + "/"
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"] + "/"
+_profiles: Dict[str, "RouteProfile"] = {}
+
+
+class RouteProfile:
+    """Collapsed stacks accumulated over every profiled request of one route."""
+
+    def __init__(self):
+        self.requests = 0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def add(self, stacks: Counter):
+        self.requests += 1
+        for stack, n in stacks.items():
+            if stack not in self.stacks and len(self.stacks) >= MAX_STACKS_PER_ROUTE:
+                stack = "(truncated)"
+            self.stacks[stack] += n
+            self.samples += n
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_BACKEND_DIR):
+        filename = filename[len(_BACKEND_DIR):]
+    elif filename.startswith(_STDLIB_DIR):
+        filename = filename[len(_STDLIB_DIR):]
+    elif "site-packages/" in filename:
+        filename = filename.split("site-packages/", 1)[1]
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _live_stack(frame, entry_code) -> List[str]:
+    """Labels from the middleware's own frame down to `frame`, outermost first."""
+    labels = []
+    while frame is not None:
+        if frame.f_code is entry_code:
+            break
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_chain(coro, entry_code) -> List[str]:
+    """Labels of a suspended coroutine chain below the middleware's frame, outermost first."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        if frame.f_code is entry_code:
+            labels.clear()
+        else:
+            labels.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return labels
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, task: asyncio.Task, loop, loop_thread_id: int, entry_code, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.task = task
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.entry_code = entry_code
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._sample()
+            except (RuntimeError, ValueError, AttributeError):
+                # The loop thread moved on while we were reading its state; skip this tick
+                continue
+
+    def _sample(self):
+        if asyncio.current_task(self.loop) is self.task:
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = _live_stack(frame, self.entry_code)
+        else:
+            stack = ["(waiting)"] + _await_chain(self.task.get_coro(), self.entry_code)
+        if stack:
+            self.stacks[";".join(stack)] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles selected requests.
+
+    Install it innermost so it runs in the same task as the endpoint.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> bool:
+        if settings.ADMIN_API_KEY:
+            headers = dict(scope.get("headers") or ())
+            if headers.get(b"x-profile") == b"1" and headers.get(b"x-admin-key") == settings.ADMIN_API_KEY.encode():
+                return True
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = _Sampler(
+            asyncio.current_task(), asyncio.get_running_loop(), threading.get_ident(),
+            ProfilingMiddleware.__call__.__code__, settings.PROFILE_INTERVAL_MS / 1000,
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stacks = sampler.stop()
+            if not stacks:
+                # Faster than one interval: record it so the request still shows up
+                stacks[f"(under {settings.PROFILE_INTERVAL_MS:g} ms)"] = 1
+            route = f"{scope['method']} {route_template(scope)}"
+            _profiles.setdefault(route, RouteProfile()).add(stacks)
+
+
+def summary() -> dict:
+    return {
+        route: {"requests": p.requests, "samples": p.samples, "stacks": len(p.stacks)}
+        for route, p in sorted(_profiles.items())
+    }
+
+
+def collapsed(route: str) -> Optional[str]:
+    profile = _profiles.get(route)
+    return profile.collapsed() if profile else None
+
+
+def reset():
+    _profiles.clear()
@@ -0,0 +1,129 @@
+"""Per-request SQL instrumentation built on SQLAlchemy engine events.
+
+Every statement executed while a request is active is counted and timed
+against that request. Statements that repeat with the same shape (same SQL,
+different parameters) are grouped so N+1 patterns such as a `session.get`
+inside a loop show up as a single pattern with a high count.
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%\([^)]+\)s|:\w+)(?:\s*,\s*(?:\?|%\([^)]+\)s|:\w+))*\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeats can be grouped."""
+    shape = _LITERAL_RE.sub("?", statement)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """Statements executed during a single request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.patterns: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.patterns[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Statement shapes executed at least `threshold` times (likely N+1)."""
+        threshold = threshold if threshold is not None else settings.N_PLUS_ONE_THRESHOLD
+        return {sql: n for sql, n in self.patterns.items() if n >= threshold}
+
+
+class RouteQueryStats:
+    """Aggregated statement counts for one route template."""
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.total_time = 0.0
+        self.max_statements = 0
+        self.n_plus_one_requests = 0
+        self.repeated_patterns: Counter = Counter()
+
+    def add(self, stats: RequestQueryStats):
+        self.requests += 1
+        self.statements += stats.count
+        self.total_time += stats.total_time
+        self.max_statements = max(self.max_statements, stats.count)
+        repeated = stats.repeated()
+        if repeated:
+            self.n_plus_one_requests += 1
+            for sql, n in repeated.items():
+                self.repeated_patterns[sql] += n
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "statements": self.statements,
+            "avg_statements": round(self.statements / self.requests, 2) if self.requests else 0,
+            "max_statements": self.max_statements,
+            "db_time_ms": round(self.total_time * 1000, 3),
+            "avg_db_time_ms": round(self.total_time * 1000 / self.requests, 3) if self.requests else 0,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "repeated_patterns": [
+                {"statement": sql, "executions": n}
+                for sql, n in self.repeated_patterns.most_common(5)
+            ],
+        }
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+_routes: Dict[str, RouteQueryStats] = {}
+
+
+def begin_request() -> RequestQueryStats:
+    stats = RequestQueryStats()
+    _current.set(stats)
+    return stats
+
+
+def end_request(route: str, stats: RequestQueryStats):
+    _current.set(None)
+    _routes.setdefault(route, RouteQueryStats()).add(stats)
+
+
+def snapshot() -> dict:
+    return {route: agg.as_dict() for route, agg in sorted(_routes.items())}
+
+
+def reset():
+    _routes.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def instrument_engine(engine: Engine):
+    """Attach the statement timing listeners to `engine`."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,19 @@
+def route_template(scope: dict) -> str:
+    """Return the matched route template (e.g. /api/v1/mcqs/{chapter_id}) for a request scope.
+
+    Depending on the FastAPI version, `scope["route"].path` is either the full
+    template or the path relative to the router it was included from, so the
+    mount prefix is recovered from the concrete URL path when it is missing.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "<unmatched>"
+    template = route.path
+    path = scope.get("path", "")
+    try:
+        suffix = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError, IndexError, ValueError):
+        return template
+    if path.endswith(suffix):
+        return path[: len(path) - len(suffix)] + template
+    return template
@@ -20,3 +20,15 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+# Exam tokens are signed with a derived key so they can never pass as access tokens
+_EXAM_KEY = f"{settings.SECRET_KEY}:exam"
+
+def create_exam_token(user_id: int, paper_id: int, started_at: datetime, expires_at: datetime) -> str:
+    to_encode = {"uid": user_id, "paper": paper_id, "start": int(started_at.timestamp()), "end": int(expires_at.timestamp())}
+    return jwt.encode(to_encode, _EXAM_KEY, algorithm=settings.ALGORITHM)
+
+def decode_exam_token(token: str) -> dict:
+    """Claims of an exam token; raises jose.JWTError if it was not issued by us."""
+    return jwt.decode(token, _EXAM_KEY, algorithms=[settings.ALGORITHM])
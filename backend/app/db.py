@@ -1,12 +1,121 @@
-from sqlmodel import create_engine, SQLModel, Session
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core import metrics
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(settings.DATABASE_URL, echo=True, connect_args=connect_args)
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+is_memory_sqlite = settings.DATABASE_URL == "sqlite://" or ":memory:" in settings.DATABASE_URL
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+sqlite_tuned = is_sqlite and settings.SQLITE_TUNED and not is_memory_sqlite
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in DATABASE_URL for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+def _sqlite_pragmas(read_only: bool):
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return apply
+
+
+# Sync engine: migrations, seed scripts and other offline tooling.
+if sqlite_tuned:
+    engine = create_engine(
+        settings.DATABASE_URL, echo=settings.SQL_ECHO, connect_args=connect_args,
+        pool_size=1, max_overflow=0,
+    )
+    event.listen(engine, "connect", _sqlite_pragmas(read_only=False))
+else:
+    engine = create_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO, connect_args=connect_args)
+
+# Async engines: everything served by the API.
+if sqlite_tuned:
+    # SQLite allows one writer at a time: give writes a single connection so they
+    # queue in the pool instead of failing with "database is locked", and serve
+    # reads from their own pool, which WAL lets run alongside the writer.
+    async_engine = create_async_engine(
+        to_async_url(settings.DATABASE_URL), echo=settings.SQL_ECHO,
+        pool_size=1, max_overflow=0,
+    )
+    async_read_engine = create_async_engine(
+        to_async_url(settings.DATABASE_URL), echo=settings.SQL_ECHO,
+        pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0,
+    )
+    event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas(read_only=False))
+    event.listen(async_read_engine.sync_engine, "connect", _sqlite_pragmas(read_only=True))
+else:
+    async_engine = create_async_engine(to_async_url(settings.DATABASE_URL), echo=settings.SQL_ECHO)
+    async_read_engine = async_engine
+
+if settings.QUERY_STATS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
+    if async_read_engine is not async_engine:
+        instrument_engine(async_read_engine.sync_engine)
+
+if settings.METRICS_ENABLED:
+    metrics.track_pool("write", async_engine.sync_engine.pool)
+    if async_read_engine is not async_engine:
+        metrics.track_pool("read", async_read_engine.sync_engine.pool)
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    return config
 
 def init_db():
-    SQLModel.metadata.create_all(engine)
+    """Bring the schema up to date by running the Alembic migration chain."""
+    from alembic import command
+
+    command.upgrade(_alembic_config(), "head")
+
+def ensure_schema():
+    """Check the database is at the latest migration, upgrading it when AUTO_MIGRATE is on.
+
+    A database that is already current costs one read of alembic_version.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory.from_config(_alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current == head:
+        return
+    if not settings.AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}. Run `alembic upgrade head`."
+        )
+    init_db()
+
+async def get_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
 
-def get_session():
-    with Session(engine) as session:
+async def get_read_session():
+    """Session bound to the read pool, for endpoints that never write."""
+    async with AsyncSession(async_read_engine, expire_on_commit=False) as session:
         yield session
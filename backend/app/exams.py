@@ -0,0 +1,188 @@
+"""Mock-exam papers and grading.
+
+A paper is a shuffled list of MCQ ids drawn round-robin from every chapter
+of a subject, so each chapter contributes an equal share (chapters with
+fewer questions give all they have). Each subject gets a small pool of
+papers, built lazily on first use and stored in `exam_papers`. Every
+student starting an exam draws one at random. Papers never change once
+built, so their questions are cached in-process after the first load.
+
+An answer sheet is graded in one pass: one query for the answer key, one
+for the questions the student had already answered, and one for their
+progress rows. The attempts, the progress updates and the result are then
+written in a single transaction.
+"""
+import asyncio
+import random
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.compaction import answered_mcq_ids
+from app.core.config import settings
+from app.core.responses import model_columns
+from app.models import Chapter, ExamPaper, ExamResult, MCQ, Progress, UserMCQAttempt
+from app.models.exam import ExamQuestion
+
+
+class Paper:
+    __slots__ = ("id", "subject_id", "duration_seconds", "mcq_ids", "questions")
+
+    def __init__(self, id: int, subject_id: int, duration_seconds: int, questions: List[dict]):
+        self.id = id
+        self.subject_id = subject_id
+        self.duration_seconds = duration_seconds
+        self.questions = questions
+        self.mcq_ids = [question["id"] for question in questions]
+
+
+_papers: Dict[int, Paper] = {}
+_pools: Dict[int, List[int]] = {}  # subject id -> paper ids
+_build_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def balanced_sample(by_chapter: Dict[int, List[int]], size: int, rng: random.Random = random) -> List[int]:
+    """Up to `size` ids taken round-robin across chapters, then shuffled."""
+    queues = [rng.sample(ids, len(ids)) for ids in by_chapter.values()]
+    rng.shuffle(queues)
+    picked = []
+    for depth in range(max(map(len, queues), default=0)):
+        for queue in queues:
+            if depth < len(queue):
+                picked.append(queue[depth])
+                if len(picked) == size:
+                    rng.shuffle(picked)
+                    return picked
+    rng.shuffle(picked)
+    return picked
+
+
+async def build_paper(session: AsyncSession, subject_id: int) -> Optional[int]:
+    rows = (await session.exec(
+        select(MCQ.id, MCQ.chapter_id)
+        .join(Chapter, Chapter.id == MCQ.chapter_id)
+        .where(Chapter.subject_id == subject_id)
+    )).all()
+    if not rows:
+        return None
+    by_chapter = defaultdict(list)
+    for mcq_id, chapter_id in rows:
+        by_chapter[chapter_id].append(mcq_id)
+    mcq_ids = balanced_sample(by_chapter, settings.EXAM_QUESTIONS_PER_PAPER)
+    paper = ExamPaper(subject_id=subject_id, mcq_ids=mcq_ids,
+                      duration_seconds=len(mcq_ids) * settings.EXAM_SECONDS_PER_QUESTION)
+    session.add(paper)
+    await session.commit()
+    return paper.id
+
+
+async def pick_paper(read_session: AsyncSession, session: AsyncSession, subject_id: int) -> Optional[int]:
+    """A random paper id from the subject's pool, building one if the pool is not full yet."""
+    pool = _pools.get(subject_id)
+    if pool is None or len(pool) < settings.EXAM_PAPERS_PER_SUBJECT:
+        async with _build_locks[subject_id]:
+            # Other workers may have built papers since we last looked
+            pool = _pools[subject_id] = list((await read_session.exec(
+                select(ExamPaper.id).where(ExamPaper.subject_id == subject_id)
+            )).all())
+            if len(pool) < settings.EXAM_PAPERS_PER_SUBJECT:
+                paper_id = await build_paper(session, subject_id)
+                if paper_id is None:
+                    return None
+                pool.append(paper_id)
+    return random.choice(pool)
+
+
+async def load_paper(session: AsyncSession, paper_id: int) -> Optional[Paper]:
+    paper = _papers.get(paper_id)
+    if paper is not None:
+        return paper
+    row = await session.get(ExamPaper, paper_id)
+    if row is None:
+        return None
+    questions = (await session.exec(
+        select(*model_columns(MCQ, ExamQuestion)).where(MCQ.id.in_(row.mcq_ids))
+    )).mappings().all()
+    by_id = {question["id"]: dict(question) for question in questions}
+    # Questions deleted since the paper was built are dropped
+    paper = Paper(row.id, row.subject_id, row.duration_seconds,
+                  [by_id[mcq_id] for mcq_id in row.mcq_ids if mcq_id in by_id])
+    _papers[paper_id] = paper
+    return paper
+
+
+async def grade(session: AsyncSession, user_id: int, paper: Paper, started_at: datetime,
+                answers: Dict[int, str]) -> dict:
+    """Grade an answer sheet and record it; the caller commits."""
+    selected = {
+        mcq_id: answer.strip().upper()
+        for mcq_id, answer in answers.items()
+        if answer and answer.strip()
+    }
+    key = {
+        mcq_id: (chapter_id, correct.upper())
+        for mcq_id, chapter_id, correct in (await session.exec(
+            select(MCQ.id, MCQ.chapter_id, MCQ.correct).where(MCQ.id.in_(paper.mcq_ids))
+        )).all()
+    }
+    answered_before = await answered_mcq_ids(session, user_id, [mcq_id for mcq_id in selected if mcq_id in key])
+
+    now = datetime.now(timezone.utc)
+    per_chapter = defaultdict(lambda: [0, 0])
+    results = []
+    answered = correct_count = 0
+    for mcq_id in paper.mcq_ids:
+        if mcq_id not in key:
+            continue
+        chapter_id, correct = key[mcq_id]
+        choice = selected.get(mcq_id)
+        is_correct = choice == correct
+        per_chapter[chapter_id][0] += 1
+        per_chapter[chapter_id][1] += is_correct
+        correct_count += is_correct
+        if choice is not None:
+            answered += 1
+            # Only a student's first answer to a question is kept, as with POST /attempts
+            if mcq_id not in answered_before:
+                session.add(UserMCQAttempt(user_id=user_id, chapter_id=chapter_id, mcq_id=mcq_id,
+                                           selected_answer=choice, is_correct=is_correct, attempted_at=now))
+        results.append({"mcq_id": mcq_id, "selected_answer": choice, "correct": correct, "is_correct": is_correct})
+
+    progress_rows = {
+        progress.chapter_id: progress
+        for progress in (await session.exec(
+            select(Progress).where(Progress.user_id == user_id).where(Progress.chapter_id.in_(list(per_chapter)))
+        )).all()
+    }
+    for chapter_id, (total, n_correct) in per_chapter.items():
+        accuracy = n_correct / total * 100
+        progress = progress_rows.get(chapter_id)
+        # Same update rule as /revision/progress/update
+        if progress is None:
+            session.add(Progress(user_id=user_id, chapter_id=chapter_id, accuracy=accuracy, streak=1,
+                                 last_practiced=now))
+        else:
+            progress.accuracy = (progress.accuracy + accuracy) / 2
+            progress.streak += 1
+            progress.last_practiced = now
+            session.add(progress)
+
+    total = len(results)
+    score = round(correct_count / total * 100, 1) if total else 0.0
+    session.add(ExamResult(user_id=user_id, paper_id=paper.id, started_at=started_at, submitted_at=now,
+                           total=total, answered=answered, correct=correct_count, score=score))
+    return {
+        "paper_id": paper.id,
+        "total": total,
+        "answered": answered,
+        "correct": correct_count,
+        "score": score,
+        "chapters": [
+            {"chapter_id": chapter_id, "total": total_in_chapter, "correct": n_correct}
+            for chapter_id, (total_in_chapter, n_correct) in per_chapter.items()
+        ],
+        "answers": results,
+    }
@@ -0,0 +1,308 @@
+"""Streaming, batched content importer.
+
+Content files are flat: one row per question (or per catalogue entry), each
+naming its class, subject and chapter. Rows are streamed from disk, grouped
+into batches, and each batch is written in one transaction with executemany
+inserts/updates, so memory stays bounded by the batch size no matter how big
+the syllabus is.
+
+Imports are idempotent. Classes, subjects and chapters are matched by name
+within their parent; questions and flashcards are matched by question text
+within their chapter and updated in place when their other fields changed.
+
+Row keys (JSON) / column headers (CSV):
+    class, subject, chapter          required on every row
+    type                             "mcq", "flashcard", or empty for a catalogue-only row
+    question, option_a..option_d, correct        for mcq rows
+    question, answer                             for flashcard rows
+"""
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam, insert, select, tuple_, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import SchoolClass, Subject, Chapter, MCQ, Flashcard
+
+BATCH_SIZE = 5000
+
+MCQ_FIELDS = ("option_a", "option_b", "option_c", "option_d", "correct")
+FLASHCARD_FIELDS = ("answer",)
+
+
+# ─── Readers ──────────────────────────────────────────────────────────────────
+
+def _iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    eof = False
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,")
+        if not started and buffer:
+            if buffer[0] != "[":
+                raise ValueError("JSON content file must contain a top-level array")
+            buffer = buffer[1:]
+            started = True
+            continue
+        if buffer.startswith("]"):
+            return
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield obj
+                buffer = buffer[end:]
+                continue
+        if eof:
+            if started:
+                raise ValueError("Unterminated JSON array in content file")
+            return
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def read_rows(path: Path) -> Iterator[dict]:
+    """Stream rows from a .csv, .jsonl/.ndjson or .json (array) content file."""
+    suffix = path.suffix.lower()
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix == ".csv":
+            yield from csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == ".json":
+            yield from _iter_json_array(f)
+        else:
+            raise ValueError(f"Unsupported content file type: {path.name}")
+
+
+def _is_datetime(column) -> bool:
+    # Unwrap TypeDecorators such as SQLModel's UTC datetime column type
+    return isinstance(getattr(column.type, "impl_instance", column.type), DateTime)
+
+
+def _sqlite_datetime(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def bulk_insert(conn: Connection, table, rows: List[dict]):
+    """Insert `rows` (dicts with the same keys) with one DBAPI executemany.
+
+    SQLAlchemy's per-row bind processing dominates large executemany batches,
+    so the compiled INSERT is handed to the driver with raw values instead.
+    On SQLite, datetimes are rendered the way SQLAlchemy stores them.
+    """
+    columns = list(rows[0])
+    compiled = insert(table).values({c: bindparam(c) for c in columns}).compile(dialect=conn.dialect)
+    if conn.dialect.name == "sqlite":
+        dt_columns = [c for c in columns if _is_datetime(table.c[c])]
+        if dt_columns:
+            rows = [{**row, **{c: _sqlite_datetime(row[c]) for c in dt_columns}} for row in rows]
+    if compiled.positional:
+        order = compiled.positiontup
+        params = [tuple(row[c] for c in order) for row in rows]
+    else:
+        params = rows
+    conn.exec_driver_sql(str(compiled), params)
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ─── Import ───────────────────────────────────────────────────────────────────
+
+class ImportStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.created = {"classes": 0, "subjects": 0, "chapters": 0}
+        self.inserted = {"mcqs": 0, "flashcards": 0}
+        self.updated = {"mcqs": 0, "flashcards": 0}
+        self.unchanged = 0
+        self.errors = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.rows} rows in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s) | "
+            f"created {self.created['classes']} classes, {self.created['subjects']} subjects, "
+            f"{self.created['chapters']} chapters | "
+            f"mcqs +{self.inserted['mcqs']} ~{self.updated['mcqs']} | "
+            f"flashcards +{self.inserted['flashcards']} ~{self.updated['flashcards']} | "
+            f"unchanged {self.unchanged} | errors {self.errors}"
+        )
+
+
+def _clean(value) -> str:
+    return (value or "").strip() if isinstance(value, str) or value is None else str(value).strip()
+
+
+class ContentImporter:
+    def __init__(self, engine: Engine, batch_size: int = BATCH_SIZE,
+                 progress: Optional[Callable[[str], None]] = print):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.progress = progress
+        self.stats = ImportStats()
+        # Catalogue lookups; a full syllabus is a few thousand entries at most
+        self.classes: Dict[str, int] = {}
+        self.subjects: Dict[Tuple[int, str], int] = {}
+        self.chapters: Dict[Tuple[int, str], int] = {}
+
+    def run(self, rows: Iterable[dict]) -> ImportStats:
+        with self.engine.connect() as conn:
+            self._load_catalogue(conn)
+        for batch in batched(rows, self.batch_size):
+            with self.engine.begin() as conn:
+                self._import_batch(conn, batch)
+            self.stats.rows += len(batch)
+            if self.progress:
+                self.progress(
+                    f"  {self.stats.rows:>10,} rows  {self.stats.rows_per_second:>10,.0f} rows/s"
+                )
+        return self.stats
+
+    def _load_catalogue(self, conn: Connection):
+        classes, subjects, chapters = SchoolClass.__table__, Subject.__table__, Chapter.__table__
+        self.classes = {name: id_ for id_, name in conn.execute(select(classes.c.id, classes.c.name))}
+        self.subjects = {
+            (class_id, name): id_
+            for id_, class_id, name in conn.execute(select(subjects.c.id, subjects.c.class_id, subjects.c.name))
+        }
+        self.chapters = {
+            (subject_id, title): id_
+            for id_, subject_id, title in conn.execute(select(chapters.c.id, chapters.c.subject_id, chapters.c.title))
+        }
+
+    def _import_batch(self, conn: Connection, batch: List[dict]):
+        rows = []
+        for raw in batch:
+            row = {key: _clean(value) for key, value in raw.items() if key}
+            if not (row.get("class") and row.get("subject") and row.get("chapter")):
+                self.stats.errors += 1
+                continue
+            rows.append(row)
+
+        self._create_missing_catalogue(conn, rows)
+
+        mcqs: Dict[Tuple[int, str], dict] = {}
+        flashcards: Dict[Tuple[int, str], dict] = {}
+        for row in rows:
+            class_id = self.classes[row["class"]]
+            subject_id = self.subjects[(class_id, row["subject"])]
+            chapter_id = self.chapters[(subject_id, row["chapter"])]
+            kind = row.get("type", "").lower()
+            if not kind:
+                continue
+            question = row.get("question", "")
+            if not question or kind not in ("mcq", "flashcard"):
+                self.stats.errors += 1
+                continue
+            if kind == "mcq":
+                values = {field: row.get(field, "") for field in MCQ_FIELDS}
+                values["correct"] = (values["correct"] or "A").upper()
+                mcqs[(chapter_id, question)] = values
+            else:
+                flashcards[(chapter_id, question)] = {"answer": row.get("answer", "")}
+
+        if mcqs:
+            self._upsert_questions(conn, MCQ.__table__, MCQ_FIELDS, mcqs, "mcqs")
+        if flashcards:
+            self._upsert_questions(conn, Flashcard.__table__, FLASHCARD_FIELDS, flashcards, "flashcards")
+
+    def _create_missing_catalogue(self, conn: Connection, rows: List[dict]):
+        classes, subjects, chapters = SchoolClass.__table__, Subject.__table__, Chapter.__table__
+
+        new_classes = {row["class"] for row in rows} - self.classes.keys()
+        if new_classes:
+            conn.execute(insert(classes), [{"name": name} for name in sorted(new_classes)])
+            self.classes.update(
+                (name, id_) for id_, name in conn.execute(
+                    select(classes.c.id, classes.c.name).where(classes.c.name.in_(new_classes))
+                )
+            )
+            self.stats.created["classes"] += len(new_classes)
+
+        new_subjects = {(self.classes[row["class"]], row["subject"]) for row in rows} - self.subjects.keys()
+        if new_subjects:
+            conn.execute(insert(subjects), [{"class_id": c, "name": n} for c, n in sorted(new_subjects)])
+            self.subjects.update(
+                ((class_id, name), id_) for id_, class_id, name in conn.execute(
+                    select(subjects.c.id, subjects.c.class_id, subjects.c.name)
+                    .where(tuple_(subjects.c.class_id, subjects.c.name).in_(list(new_subjects)))
+                )
+            )
+            self.stats.created["subjects"] += len(new_subjects)
+
+        new_chapters = {
+            (self.subjects[(self.classes[row["class"]], row["subject"])], row["chapter"]) for row in rows
+        } - self.chapters.keys()
+        if new_chapters:
+            conn.execute(insert(chapters), [{"subject_id": s, "title": t} for s, t in sorted(new_chapters)])
+            self.chapters.update(
+                ((subject_id, title), id_) for id_, subject_id, title in conn.execute(
+                    select(chapters.c.id, chapters.c.subject_id, chapters.c.title)
+                    .where(tuple_(chapters.c.subject_id, chapters.c.title).in_(list(new_chapters)))
+                )
+            )
+            self.stats.created["chapters"] += len(new_chapters)
+
+    def _upsert_questions(self, conn: Connection, table, fields, incoming: Dict[Tuple[int, str], dict], name: str):
+        """Insert new (chapter_id, question) keys and update changed ones, one executemany each."""
+        chapter_ids = {chapter_id for chapter_id, _ in incoming}
+        existing = {}
+        for row in conn.execute(
+            select(table.c.id, table.c.chapter_id, table.c.question, *[table.c[f] for f in fields])
+            .where(table.c.chapter_id.in_(chapter_ids))
+        ):
+            existing[(row.chapter_id, row.question)] = row
+
+        inserts, updates = [], []
+        for (chapter_id, question), values in incoming.items():
+            current = existing.get((chapter_id, question))
+            if current is None:
+                inserts.append({"chapter_id": chapter_id, "question": question, **values})
+            elif any(getattr(current, f) != values[f] for f in fields):
+                updates.append({"_id": current.id, **values})
+            else:
+                self.stats.unchanged += 1
+
+        if inserts:
+            bulk_insert(conn, table, inserts)
+            self.stats.inserted[name] += len(inserts)
+        if updates:
+            conn.execute(
+                update(table).where(table.c.id == bindparam("_id")).values({f: bindparam(f) for f in fields}),
+                updates,
+            )
+            self.stats.updated[name] += len(updates)
@@ -1,40 +1,122 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import auth, content, revision, ai
+from app.api.v1 import auth, content, revision, ai, admin, search, exams, bootstrap
+from app.core import metrics, profiling, query_stats
+from app.core.compression import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.routes import route_template
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from app.db import init_db
+from app.db import ensure_schema, async_engine, async_read_engine
 
 limiter = Limiter(key_func=get_remote_address)
 
-# Initialize database
-init_db()
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description="Backend API for the NCERT Smart Revision Mobile App",
-    version=settings.VERSION,
+# Writes the app retries on flaky networks. Auth routes stay off this list:
+# their responses hold access tokens, which must not be stored for replay.
+IDEMPOTENT_ROUTES = (
+    "/attempts",
+    "/revision/progress/update",
+    "/ai/generate-mcq/{chapter_id}",
+    "/ai/generate-flashcard/{chapter_id}",
 )
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# CORS setup for mobile app/frontend access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Adjust in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema check runs once per process at startup, never at import time
+    ensure_schema()
+    yield
+    await ai.ai_router.aclose()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description="Backend API for the NCERT Smart Revision Mobile App",
+        version=settings.VERSION,
+        lifespan=lifespan,
+    )
+
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    if settings.PROFILING_ENABLED:
+        # Added first so it is innermost and shares the endpoint's task
+        app.add_middleware(profiling.ProfilingMiddleware)
+
+    # CORS setup for mobile app/frontend access
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Adjust in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count", "Idempotent-Replayed"],
+    )
+
+    app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
+    app.include_router(content.router, prefix=f"{settings.API_V1_STR}", tags=["content"])
+    app.include_router(revision.router, prefix=f"{settings.API_V1_STR}/revision", tags=["revision"])
+    app.include_router(ai.router, prefix=f"{settings.API_V1_STR}/ai", tags=["ai"])
+    app.include_router(search.router, prefix=f"{settings.API_V1_STR}", tags=["search"])
+    app.include_router(exams.router, prefix=f"{settings.API_V1_STR}", tags=["exams"])
+    app.include_router(bootstrap.router, prefix=f"{settings.API_V1_STR}", tags=["bootstrap"])
+    app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
+
+    if settings.QUERY_STATS_ENABLED:
+        @app.middleware("http")
+        async def record_query_stats(request: Request, call_next):
+            stats = query_stats.begin_request()
+            try:
+                response = await call_next(request)
+            finally:
+                # Also on errors, so a failing request neither leaks its stats into the context nor goes uncounted
+                query_stats.end_request(route_template(request.scope), stats)
+            if settings.DEBUG:
+                response.headers["X-DB-Query-Count"] = str(stats.count)
+                response.headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.3f}"
+                repeated = stats.repeated()
+                if repeated:
+                    response.headers["X-DB-N-Plus-One"] = str(max(repeated.values()))
+            return response
+
+    if settings.IDEMPOTENCY_ENABLED:
+        # Outside query stats and inside compression, so stored bodies are uncompressed
+        app.add_middleware(
+            IdempotencyMiddleware,
+            engine=async_engine,
+            paths=[f"{settings.API_V1_STR}{path}" for path in IDEMPOTENT_ROUTES],
+            ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+        )
+
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_level=settings.GZIP_LEVEL,
+            brotli_quality=settings.BROTLI_QUALITY,
+        )
+
+    if settings.METRICS_ENABLED:
+        # Added last so it wraps everything else and times the whole request
+        app.add_middleware(metrics.MetricsMiddleware)
+
+        @app.get("/metrics", include_in_schema=False)
+        async def read_metrics():
+            return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to NCERT Smart Revision API"}
+
+    return app
 
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
-app.include_router(content.router, prefix=f"{settings.API_V1_STR}", tags=["content"])
-app.include_router(revision.router, prefix=f"{settings.API_V1_STR}/revision", tags=["revision"])
-app.include_router(ai.router, prefix=f"{settings.API_V1_STR}/ai", tags=["ai"])
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to NCERT Smart Revision API"}
+app = create_app()
@@ -5,4 +5,8 @@ from .chapter import Chapter
 from .flashcard import Flashcard
 from .mcq import MCQ
 from .progress import Progress
-from .mcq_attempt import UserMCQAttempt, UserResetLog
+from .mcq_attempt import UserMCQAttempt, UserResetLog, AttemptSummary, UserMCQAttemptArchive, AnsweredMCQ
+from .api_usage import ApiUsage
+from .weekly_report import WeeklyReport
+from .exam import ExamPaper, ExamResult
+from .idempotency import IdempotencyKey
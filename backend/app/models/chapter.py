@@ -8,7 +8,7 @@ class ChapterBase(SQLModel):
 class Chapter(ChapterBase, table=True):
     __tablename__ = "chapters"
     id: Optional[int] = Field(default=None, primary_key=True)
-    subject_id: int = Field(foreign_key="subjects.id")
+    subject_id: int = Field(foreign_key="subjects.id", index=True)
     
     subject: Optional[Subject] = Relationship(back_populates="chapters")
     flashcards: List["Flashcard"] = Relationship(back_populates="chapter")
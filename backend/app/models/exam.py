@@ -0,0 +1,81 @@
+from typing import Dict, List, Optional
+from sqlalchemy import JSON, Column, Index
+from sqlmodel import Field, SQLModel
+from datetime import datetime, timezone
+
+
+class ExamPaper(SQLModel, table=True):
+    """A pre-built, shuffled mock-exam paper drawn from every chapter of a subject."""
+    __tablename__ = "exam_papers"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    subject_id: int = Field(foreign_key="subjects.id", index=True)
+    mcq_ids: List[int] = Field(sa_column=Column(JSON, nullable=False))  # in paper order
+    duration_seconds: int
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ExamResult(SQLModel, table=True):
+    """One graded submission; unique per started exam so an answer sheet is only counted once."""
+    __tablename__ = "exam_results"
+    __table_args__ = (
+        Index("uq_exam_results_user_paper_start", "user_id", "paper_id", "started_at", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    paper_id: int = Field(foreign_key="exam_papers.id")
+    started_at: datetime
+    submitted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    total: int
+    answered: int
+    correct: int
+    score: float  # % of the paper answered correctly
+
+
+class ExamQuestion(SQLModel):
+    id: int
+    chapter_id: int
+    question: str
+    option_a: str
+    option_b: str
+    option_c: str
+    option_d: str
+
+
+class ExamPaperResponse(SQLModel):
+    paper_id: int
+    subject_id: int
+    duration_seconds: int
+    started_at: datetime
+    expires_at: datetime
+    token: str  # send back with the answer sheet
+    questions: List[ExamQuestion]
+
+
+class ExamSubmission(SQLModel):
+    token: str
+    answers: Dict[int, str]  # mcq_id -> A / B / C / D; unanswered questions are left out
+
+
+class ExamAnswer(SQLModel):
+    mcq_id: int
+    selected_answer: Optional[str] = None
+    correct: str
+    is_correct: bool
+
+
+class ExamChapterScore(SQLModel):
+    chapter_id: int
+    total: int
+    correct: int
+
+
+class ExamResultResponse(SQLModel):
+    paper_id: int
+    total: int
+    answered: int
+    correct: int
+    score: float
+    chapters: List[ExamChapterScore]
+    answers: List[ExamAnswer]
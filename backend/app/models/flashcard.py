@@ -9,7 +9,7 @@ class FlashcardBase(SQLModel):
 class Flashcard(FlashcardBase, table=True):
     __tablename__ = "flashcards"
     id: Optional[int] = Field(default=None, primary_key=True)
-    chapter_id: int = Field(foreign_key="chapters.id")
+    chapter_id: int = Field(foreign_key="chapters.id", index=True)
     
     chapter: Optional[Chapter] = Relationship(back_populates="flashcards")
 
@@ -0,0 +1,23 @@
+from typing import List, Optional
+from sqlalchemy import JSON, Column, Index, LargeBinary
+from sqlmodel import Field, SQLModel
+from datetime import datetime, timezone
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """A write request's stored response, replayed when the client retries with the same Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("uq_idempotency_keys_scope_key", "scope", "key", unique=True),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    scope: str  # hash of the caller's Authorization header, so keys never collide across users
+    key: str
+    request_hash: str  # method, path and body; a reused key with a different request is rejected
+    status_code: Optional[int] = None  # None while the first request is still running
+    headers: List[List[str]] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    body: bytes = Field(default=b"", sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: datetime
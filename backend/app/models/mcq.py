@@ -13,7 +13,7 @@ class MCQBase(SQLModel):
 class MCQ(MCQBase, table=True):
     __tablename__ = "mcqs"
     id: Optional[int] = Field(default=None, primary_key=True)
-    chapter_id: int = Field(foreign_key="chapters.id")
+    chapter_id: int = Field(foreign_key="chapters.id", index=True)
     
     chapter: Optional[Chapter] = Relationship(back_populates="mcqs")
 
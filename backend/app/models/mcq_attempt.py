@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import datetime, timezone
 
@@ -6,9 +7,13 @@ from datetime import datetime, timezone
 class UserMCQAttempt(SQLModel, table=True):
     """Stores every answer a user gives to an MCQ question."""
     __tablename__ = "user_mcq_attempts"
+    __table_args__ = (
+        Index("uq_user_mcq_attempts_user_mcq", "user_id", "mcq_id", unique=True),
+        Index("ix_user_mcq_attempts_user_chapter", "user_id", "chapter_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
+    user_id: int = Field(foreign_key="users.id")
     chapter_id: int = Field(foreign_key="chapters.id", index=True)
     mcq_id: int = Field(foreign_key="mcqs.id")
     selected_answer: str          # A / B / C / D
@@ -24,3 +29,49 @@ class UserResetLog(SQLModel, table=True):
     user_id: int = Field(foreign_key="users.id", index=True)
     chapter_id: int = Field(foreign_key="chapters.id", index=True)
     reset_count: int = Field(default=0)
+
+
+class AttemptSummary(SQLModel, table=True):
+    """Per-user, per-chapter totals for attempts compacted out of user_mcq_attempts.
+
+    Lifetime stats are these totals plus whatever is still in the hot table.
+    """
+    __tablename__ = "attempt_summaries"
+    __table_args__ = (
+        Index("uq_attempt_summaries_user_chapter", "user_id", "chapter_id", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    chapter_id: int = Field(foreign_key="chapters.id")
+    attempts: int = Field(default=0)
+    correct: int = Field(default=0)
+    last_attempt_at: datetime
+
+
+class UserMCQAttemptArchive(SQLModel, table=True):
+    """Raw attempts moved out of user_mcq_attempts by compaction; cold storage, so no secondary indexes."""
+    __tablename__ = "user_mcq_attempts_archive"
+
+    id: int = Field(primary_key=True)  # keeps the original user_mcq_attempts id
+    user_id: int
+    chapter_id: int
+    mcq_id: int
+    selected_answer: str
+    is_correct: bool
+    attempted_at: datetime
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AnsweredMCQ(SQLModel, table=True):
+    """(user, question) pairs whose attempt was compacted out of user_mcq_attempts.
+
+    Only a student's first answer counts, so these questions stay answered
+    after their raw attempt moves to the archive.
+    """
+    __tablename__ = "answered_mcqs"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    user_id: int = Field(primary_key=True)
+    mcq_id: int = Field(primary_key=True)
+    chapter_id: int
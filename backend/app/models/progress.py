@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import datetime, timezone
 from .user import User
@@ -11,6 +12,9 @@ class ProgressBase(SQLModel):
 
 class Progress(ProgressBase, table=True):
     __tablename__ = "progress"
+    __table_args__ = (
+        Index("uq_progress_user_chapter", "user_id", "chapter_id", unique=True),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
     chapter_id: int = Field(foreign_key="chapters.id")
@@ -8,7 +8,7 @@ class SubjectBase(SQLModel):
 class Subject(SubjectBase, table=True):
     __tablename__ = "subjects"
     id: Optional[int] = Field(default=None, primary_key=True)
-    class_id: int = Field(foreign_key="classes.id")
+    class_id: int = Field(foreign_key="classes.id", index=True)
     
     school_class: Optional[SchoolClass] = Relationship(back_populates="subjects")
     chapters: List["Chapter"] = Relationship(back_populates="subject")
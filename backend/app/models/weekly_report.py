@@ -0,0 +1,43 @@
+from typing import List, Optional
+from sqlalchemy import JSON, Column, Index
+from sqlmodel import Field, SQLModel
+from datetime import date, datetime, timezone
+
+
+class WeakChapter(SQLModel):
+    chapter_id: int
+    title: str
+    attempts: int
+    accuracy: float
+
+
+class WeeklyReportBase(SQLModel):
+    week_start: date  # Monday, UTC
+    attempts: int = 0
+    correct: int = 0
+    accuracy: float = 0.0
+    active_days: int = 0
+    chapters_practiced: int = 0
+    chapters_in_class: int = 0
+    coverage: float = 0.0  # chapters practiced so far / chapters in the user's class, in %
+    best_streak: int = 0
+
+
+class WeeklyReport(WeeklyReportBase, table=True):
+    """One user's precomputed weekly summary, written by the nightly report job."""
+    __tablename__ = "weekly_reports"
+    __table_args__ = (
+        Index("uq_weekly_reports_user_week", "user_id", "week_start", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    weakest_chapters: List[dict] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class WeeklyReportResponse(WeeklyReportBase):
+    user_id: int
+    user_type: Optional[str] = None
+    weakest_chapters: List[WeakChapter]
+    generated_at: datetime
@@ -0,0 +1,146 @@
+"""Nightly weekly report job.
+
+Builds one `weekly_reports` row per user who practiced during the week, so
+the report endpoint reads a single precomputed row instead of aggregating
+attempts per request.
+
+Users are processed in id ranges. For each range the database does the
+aggregation: attempts are grouped by (user, chapter, day) for the week and
+progress by user, both as index range scans on their user_id-leading
+indexes. Across all ranges that is a single pass over each table, and memory
+stays bounded by the range size. Each range's rows are replaced in one short
+transaction, so re-running the job for a week is safe and never holds the
+SQLite write lock for long.
+"""
+import time
+from collections import defaultdict
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, cast, delete, func, select
+from sqlalchemy.engine import Engine
+
+from app.models import Chapter, Progress, Subject, User, UserMCQAttempt, WeeklyReport
+
+USER_RANGE = 5000
+WEAKEST_MIN_ATTEMPTS = 3  # a chapter needs this many answers in the week to count as weak
+WEAKEST_LIMIT = 3
+
+
+def week_start_of(day: date) -> date:
+    """The Monday starting the week that contains `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def _week_bounds(week_start: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(week_start, dt_time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=7)
+
+
+def summarize_user(chapter_days: List[Tuple[int, object, int, int]], chapter_titles: Dict[int, str]) -> dict:
+    """Fold one user's (chapter_id, day, attempts, correct) groups into report fields."""
+    attempts = correct = 0
+    days = set()
+    per_chapter = defaultdict(lambda: [0, 0])
+    for chapter_id, day, n, n_correct in chapter_days:
+        attempts += n
+        correct += n_correct
+        days.add(day)
+        per_chapter[chapter_id][0] += n
+        per_chapter[chapter_id][1] += n_correct
+
+    weakest = sorted(
+        (
+            (n_correct / n * 100, -n, chapter_id)
+            for chapter_id, (n, n_correct) in per_chapter.items()
+            if n >= WEAKEST_MIN_ATTEMPTS
+        ),
+    )[:WEAKEST_LIMIT]
+    return {
+        "attempts": attempts,
+        "correct": correct,
+        "accuracy": round(correct / attempts * 100, 1) if attempts else 0.0,
+        "active_days": len(days),
+        "chapters_practiced": len(per_chapter),
+        "weakest_chapters": [
+            {"chapter_id": chapter_id, "title": chapter_titles.get(chapter_id, ""),
+             "attempts": -neg_n, "accuracy": round(accuracy, 1)}
+            for accuracy, neg_n, chapter_id in weakest
+        ],
+    }
+
+
+def build_weekly_reports(engine: Engine, week_start: date, user_range: int = USER_RANGE,
+                         progress: Optional[Callable[[str], None]] = print) -> int:
+    """Compute and store every user's report for the week starting `week_start`; returns the row count."""
+    attempts_t, progress_t, users_t = UserMCQAttempt.__table__, Progress.__table__, User.__table__
+    chapters_t, subjects_t, reports_t = Chapter.__table__, Subject.__table__, WeeklyReport.__table__
+    start, end = _week_bounds(week_start)
+    started = time.perf_counter()
+    generated_at = datetime.now(timezone.utc)
+
+    with engine.connect() as conn:
+        max_user_id = conn.execute(select(func.max(users_t.c.id))).scalar() or 0
+        chapter_titles = dict(conn.execute(select(chapters_t.c.id, chapters_t.c.title)).all())
+        chapters_per_class = dict(conn.execute(
+            select(subjects_t.c.class_id, func.count(chapters_t.c.id))
+            .join(chapters_t, chapters_t.c.subject_id == subjects_t.c.id)
+            .group_by(subjects_t.c.class_id)
+        ).all())
+
+    written = 0
+    for low in range(1, max_user_id + 1, user_range):
+        high = low + user_range - 1
+        with engine.connect() as conn:
+            groups = conn.execute(
+                select(
+                    attempts_t.c.user_id, attempts_t.c.chapter_id, func.date(attempts_t.c.attempted_at),
+                    func.count(), func.sum(cast(attempts_t.c.is_correct, Integer)),
+                )
+                .where(attempts_t.c.user_id.between(low, high))
+                .where(attempts_t.c.attempted_at >= start, attempts_t.c.attempted_at < end)
+                .group_by(attempts_t.c.user_id, attempts_t.c.chapter_id, func.date(attempts_t.c.attempted_at))
+            ).all()
+            by_user = defaultdict(list)
+            for user_id, chapter_id, day, n, n_correct in groups:
+                by_user[user_id].append((chapter_id, day, n, n_correct or 0))
+            if by_user:
+                progress_by_user = {
+                    user_id: (best_streak, chapters)
+                    for user_id, best_streak, chapters in conn.execute(
+                        select(progress_t.c.user_id, func.max(progress_t.c.streak), func.count())
+                        .where(progress_t.c.user_id.between(low, high))
+                        .group_by(progress_t.c.user_id)
+                    )
+                }
+                class_of = dict(conn.execute(
+                    select(users_t.c.id, users_t.c.class_id).where(users_t.c.id.in_(list(by_user)))
+                ).all())
+
+        rows = []
+        for user_id, chapter_days in by_user.items():
+            best_streak, chapters_touched = progress_by_user.get(user_id, (0, 0))
+            in_class = chapters_per_class.get(class_of.get(user_id), 0)
+            rows.append({
+                "user_id": user_id,
+                "week_start": week_start,
+                **summarize_user(chapter_days, chapter_titles),
+                "chapters_in_class": in_class,
+                "coverage": round(min(chapters_touched / in_class, 1.0) * 100, 1) if in_class else 0.0,
+                "best_streak": best_streak or 0,
+                "generated_at": generated_at,
+            })
+
+        with engine.begin() as conn:
+            conn.execute(
+                delete(reports_t)
+                .where(reports_t.c.week_start == week_start)
+                .where(reports_t.c.user_id.between(low, high))
+            )
+            if rows:
+                conn.execute(reports_t.insert(), rows)
+        written += len(rows)
+        if progress and rows:
+            progress(f"  users {low:>10,}-{high:<10,} {written:>10,} reports  "
+                     f"{time.perf_counter() - started:>8.1f}s")
+    return written
@@ -0,0 +1,131 @@
+"""Full-text search over MCQ and flashcard text.
+
+On SQLite, queries run against the `search_index` FTS5 table created by
+migration 0003 and kept current by triggers on mcqs and flashcards. Rows are
+stored at rowid 2*id for MCQs and 2*id+1 for flashcards. Results are ranked
+with BM25, weighting matches in the question above matches in the
+options/answer. Other databases fall back to case-insensitive LIKE matching
+without ranking.
+"""
+import re
+from typing import List, Optional
+
+from sqlalchemy import func, literal, or_, select, text, union_all
+from sqlalchemy.engine import Connection
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import is_sqlite
+from app.models import Chapter, Flashcard, MCQ, Subject
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+QUESTION_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+
+_FTS_SEARCH = """
+    SELECT rowid, chapter_id, class_id, question,
+           snippet(search_index, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+           bm25(search_index, {question_weight}, {body_weight}) AS score
+    FROM search_index
+    WHERE search_index MATCH :match {class_filter}
+    ORDER BY score
+    LIMIT :limit OFFSET :offset
+"""
+
+_MCQ_BODY = "{row}.option_a || ' ' || {row}.option_b || ' ' || {row}.option_c || ' ' || {row}.option_d"
+_REBUILD = [
+    "DELETE FROM search_index",
+    f"""
+    INSERT INTO search_index (rowid, question, body, chapter_id, class_id)
+    SELECT mcqs.id * 2, mcqs.question, {_MCQ_BODY.format(row='mcqs')}, mcqs.chapter_id, subjects.class_id
+    FROM mcqs JOIN chapters ON chapters.id = mcqs.chapter_id JOIN subjects ON subjects.id = chapters.subject_id
+    """,
+    """
+    INSERT INTO search_index (rowid, question, body, chapter_id, class_id)
+    SELECT flashcards.id * 2 + 1, flashcards.question, flashcards.answer, flashcards.chapter_id, subjects.class_id
+    FROM flashcards JOIN chapters ON chapters.id = flashcards.chapter_id
+    JOIN subjects ON subjects.id = chapters.subject_id
+    """,
+    "INSERT INTO search_index (search_index) VALUES ('optimize')",
+]
+
+
+def fts_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation typed by users are
+    matched literally instead of raising syntax errors.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+async def search(session: AsyncSession, query: str, class_id: Optional[int], limit: int, offset: int) -> List[dict]:
+    if is_sqlite:
+        return await _search_fts(session, query, class_id, limit, offset)
+    return await _search_like(session, query, class_id, limit, offset)
+
+
+async def _search_fts(session, query, class_id, limit, offset):
+    match = fts_query(query)
+    if match is None:
+        return []
+    statement = text(_FTS_SEARCH.format(
+        question_weight=QUESTION_WEIGHT, body_weight=BODY_WEIGHT,
+        class_filter="AND class_id = :class_id" if class_id is not None else "",
+    ))
+    params = {"match": match, "limit": limit, "offset": offset}
+    if class_id is not None:
+        params["class_id"] = class_id
+    rows = (await session.exec(statement, params=params)).mappings()
+    return [
+        {
+            "kind": "mcq" if row["rowid"] % 2 == 0 else "flashcard",
+            "id": row["rowid"] // 2,
+            "chapter_id": row["chapter_id"],
+            "class_id": row["class_id"],
+            "question": row["question"],
+            "snippet": row["snippet"],
+            "score": round(-row["score"], 4),
+        }
+        for row in rows
+    ]
+
+
+async def _search_like(session, query, class_id, limit, offset):
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+
+    def matching(model, *columns):
+        conditions = [or_(*(column.ilike(f"%{token}%") for column in columns)) for token in tokens]
+        statement = (
+            select(
+                literal("mcq" if model is MCQ else "flashcard").label("kind"),
+                model.id, model.chapter_id, Subject.class_id, model.question,
+            )
+            .join(Chapter, Chapter.id == model.chapter_id)
+            .join(Subject, Subject.id == Chapter.subject_id)
+            .where(*conditions)
+        )
+        return statement.where(Subject.class_id == class_id) if class_id is not None else statement
+
+    combined = union_all(
+        matching(MCQ, MCQ.question, MCQ.option_a, MCQ.option_b, MCQ.option_c, MCQ.option_d),
+        matching(Flashcard, Flashcard.question, Flashcard.answer),
+    ).subquery()
+    rows = (await session.exec(
+        select(combined).order_by(combined.c.kind, combined.c.id).limit(limit).offset(offset)
+    )).mappings()
+    return [{**row, "snippet": None, "score": 0.0} for row in rows]
+
+
+def rebuild(conn: Connection) -> int:
+    """Re-index every MCQ and flashcard; returns the number of indexed rows."""
+    for statement in _REBUILD:
+        conn.execute(text(statement))
+    return conn.execute(select(func.count()).select_from(text("search_index"))).scalar()
@@ -0,0 +1,357 @@
+"""HTTP benchmark: scripted student sessions against the in-process ASGI app.
+
+The app is driven through httpx's ASGI transport, so no server or network is
+involved; the AI provider and the OTP email are stubbed. Each session logs in
+as a generated user and walks the app the way a student does (browse, answer
+questions, review attempts, daily revision, progress). Sessions run
+concurrently and latency is reported per route as p50/p95/p99 together with
+overall throughput.
+
+Wall-clock latency on a shared machine is noisy, so the workload is repeated
+(--repeats, each after an unrecorded warm-up pass) and every route keeps its
+p95 from each run. The report shows the median across runs; the baseline also
+records how far the runs spread. A route only fails when its p95 is over its
+bound -- the tolerance, widened by the baseline's own spread -- in a majority
+of the runs, so a single slow run does not fail the comparison. Throughput is
+judged the same way. Baselines are machine-specific: re-record them with
+--save-baseline on the machine that runs the comparison. Run from the backend
+directory:
+
+    python bench/api.py
+    python bench/api.py --sessions 50 --iterations 5 --repeats 3 --json
+    python bench/api.py --save-baseline
+
+Without DATABASE_URL a scratch SQLite database is generated with
+generate_dataset.py's generators; with it, the database must already hold
+users created by generate_dataset.py.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+sys.path.insert(0, str(BACKEND_DIR))
+
+SCRATCH_DB = "DATABASE_URL" not in os.environ
+if SCRATCH_DB:
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+import generate_dataset  # noqa: E402
+from app.api.v1 import ai, auth  # noqa: E402
+from app.db import engine, init_db  # noqa: E402
+from app.models import Subject, Chapter, MCQ, User  # noqa: E402
+
+API = "/api/v1"
+PASSWORD = "password123"
+
+otp_outbox = {}  # email -> last OTP "sent"
+
+
+def capture_otp(email: str, otp: str) -> str:
+    otp_outbox[email] = otp
+    return "sent"
+
+
+async def fake_llm(prompt: str) -> str:
+    if "flashcards" in prompt:
+        return '[{"question": "Term", "answer": "Definition"}]'
+    return '[{"question": "Q", "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d", "correct": "A"}]'
+
+
+def prepare_database(args):
+    init_db()
+    if SCRATCH_DB:
+        dataset = argparse.Namespace(
+            users=args.users, attempts_per_user=40, chapters_per_subject=6,
+            mcqs_per_chapter=30, flashcards_per_chapter=10,
+        )
+        rng = random.Random(args.seed)
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        generate_dataset.ContentImporter(engine, progress=None).run(generate_dataset.content_rows(dataset, rng))
+        with engine.connect() as conn:
+            pools = generate_dataset.load_question_pools(conn)
+        with contextlib.redirect_stdout(sys.stderr):
+            generate_dataset.generate_users(dataset, rng, pools, now)
+
+    users_t, subjects_t, chapters_t, mcqs_t = User.__table__, Subject.__table__, Chapter.__table__, MCQ.__table__
+    with engine.connect() as conn:
+        users = conn.execute(
+            select(users_t.c.email, users_t.c.class_id)
+            .where(users_t.c.email.like("%@loadtest.local"), users_t.c.class_id.is_not(None))
+            .order_by(users_t.c.id).limit(args.sessions)
+        ).all()
+        chapters = defaultdict(list)  # class_id -> [(subject_id, chapter_id, [mcq_id, ...])]
+        rows = conn.execute(
+            select(subjects_t.c.class_id, subjects_t.c.id, chapters_t.c.id, mcqs_t.c.id)
+            .join(chapters_t, chapters_t.c.subject_id == subjects_t.c.id)
+            .join(mcqs_t, mcqs_t.c.chapter_id == chapters_t.c.id)
+            .order_by(mcqs_t.c.id)
+        )
+        by_chapter = defaultdict(list)
+        for class_id, subject_id, chapter_id, mcq_id in rows:
+            by_chapter[(class_id, subject_id, chapter_id)].append(mcq_id)
+        for (class_id, subject_id, chapter_id), mcq_ids in by_chapter.items():
+            chapters[class_id].append((subject_id, chapter_id, mcq_ids))
+    if len(users) < args.sessions:
+        sys.exit(f"Need {args.sessions} users from generate_dataset.py, found {len(users)}.")
+    return users, chapters
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # "METHOD /template" -> [seconds]
+        self.errors = defaultdict(int)
+        self.enabled = True
+
+    async def call(self, client, method, template, path=None, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, API + (path or template), **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.enabled:
+            route = f"{method} {API}{template}"
+            self.samples[route].append(elapsed)
+            if response.status_code >= 400:
+                self.errors[route] += 1
+        return response
+
+
+async def log_in(client, recorder, email):
+    response = await recorder.call(client, "POST", "/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    user_id = response.json()["user_id"]
+    response = await recorder.call(client, "POST", "/auth/verify-otp",
+                                   json={"user_id": user_id, "otp_code": otp_outbox[email]})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    await recorder.call(client, "GET", "/auth/me", headers=headers)
+    return headers
+
+
+async def student_session(client, recorder, rng, headers, class_id, chapters, iterations):
+    for _ in range(iterations):
+        subject_id, chapter_id, mcq_ids = rng.choice(chapters)
+        await recorder.call(client, "GET", "/classes", headers=headers)
+        await recorder.call(client, "GET", "/subjects/{class_id}", f"/subjects/{class_id}", headers=headers)
+        await recorder.call(client, "GET", "/chapters/{subject_id}", f"/chapters/{subject_id}", headers=headers)
+        await recorder.call(client, "GET", "/flashcards/{chapter_id}", f"/flashcards/{chapter_id}", headers=headers)
+        await recorder.call(client, "GET", "/mcqs/{chapter_id}", f"/mcqs/{chapter_id}", headers=headers)
+        answered = rng.sample(mcq_ids, min(5, len(mcq_ids)))
+        for mcq_id in answered:
+            await recorder.call(client, "POST", "/attempts", headers=headers,
+                                json={"chapter_id": chapter_id, "mcq_id": mcq_id, "selected_answer": rng.choice("ABCD")})
+        await recorder.call(client, "GET", "/attempts/{chapter_id}", f"/attempts/{chapter_id}", headers=headers)
+        await recorder.call(client, "GET", "/attempts/{chapter_id}/reset-status",
+                            f"/attempts/{chapter_id}/reset-status", headers=headers)
+        await recorder.call(client, "POST", "/revision/progress/update", headers=headers,
+                            json={"chapter_id": chapter_id, "correct_answers": rng.randint(0, len(answered)),
+                                  "total_questions": len(answered)})
+        await recorder.call(client, "GET", "/revision/daily", headers=headers)
+        await recorder.call(client, "GET", "/revision/progress/stats", headers=headers)
+        await recorder.call(client, "POST", "/ai/generate-mcq/{chapter_id}", f"/ai/generate-mcq/{chapter_id}",
+                            headers=headers)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(recorder, elapsed):
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        routes[route] = {
+            "requests": len(ordered),
+            "errors": recorder.errors.get(route, 0),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        }
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "requests": total,
+        "errors": sum(r["errors"] for r in routes.values()),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+async def run_once(client, args, repeat, users, chapters):
+    recorder = Recorder()
+    # Log everyone in first: bcrypt is CPU-bound and would otherwise
+    # skew the latency of whatever else happens to be running.
+    sessions = await asyncio.gather(*(log_in(client, recorder, email) for email, _ in users))
+
+    # Warm up pools, caches and lazy imports with one unrecorded pass
+    recorder.enabled = False
+    await student_session(client, recorder, random.Random(args.seed), sessions[0],
+                          users[0][1], chapters[users[0][1]], 1)
+    recorder.enabled = True
+
+    # Each run answers different questions, so later runs are not just "already recorded" replies
+    first_seed = args.seed + repeat * len(users)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        student_session(client, recorder, random.Random(first_seed + i), headers, class_id,
+                        chapters[class_id], args.iterations)
+        for i, (headers, (_, class_id)) in enumerate(zip(sessions, users))
+    ))
+    elapsed = time.perf_counter() - started
+    return summarize(recorder, elapsed)
+
+
+async def run(args, users, chapters):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            runs = [await run_once(client, args, repeat, users, chapters) for repeat in range(args.repeats)]
+    return combine(runs)
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def combine(runs):
+    """One result for repeated runs: medians, plus each run's p95 and throughput and their spread."""
+    routes = {}
+    for route in sorted({route for run in runs for route in run["routes"]}):
+        per_run = [run["routes"][route] for run in runs if route in run["routes"]]
+        p95s = [r["p95_ms"] for r in per_run]
+        routes[route] = {
+            "requests": sum(r["requests"] for r in per_run),
+            "errors": sum(r["errors"] for r in per_run),
+            **{key: round(median([r[key] for r in per_run]), 3) for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")},
+            "p95_runs_ms": p95s,
+            "p95_spread_ms": round(max(p95s) - min(p95s), 3),
+        }
+    throughputs = [run["throughput_rps"] for run in runs]
+    return {
+        "runs": len(runs),
+        "requests": sum(run["requests"] for run in runs),
+        "errors": sum(run["errors"] for run in runs),
+        "elapsed_s": round(sum(run["elapsed_s"] for run in runs), 3),
+        "throughput_rps": round(median(throughputs), 1),
+        "throughput_runs_rps": throughputs,
+        "throughput_spread_rps": round(max(throughputs) - min(throughputs), 1),
+        "routes": routes,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Regressions of `results` against `baseline`, as readable lines.
+
+    A route's bound is its baseline median p95 plus the larger of the
+    tolerance, min_delta_ms and the spread the baseline's own runs showed; it
+    regresses when more than half of this invocation's runs are over it.
+    """
+    regressions = []
+    runs = results["runs"]
+    for route, base in baseline["routes"].items():
+        current = results["routes"].get(route)
+        if current is None:
+            regressions.append(f"{route}: missing from this run")
+            continue
+        limit = base["p95_ms"] + max(base["p95_ms"] * tolerance, min_delta_ms, base.get("p95_spread_ms", 0.0))
+        over = sum(p95 > limit for p95 in current["p95_runs_ms"])
+        if over * 2 > runs:
+            regressions.append(f"{route}: p95 {current['p95_ms']:.1f} ms (median), over the {limit:.1f} ms bound "
+                               f"in {over} of {runs} runs; baseline {base['p95_ms']:.1f} ms")
+    floor = baseline["throughput_rps"] - max(baseline["throughput_rps"] * tolerance,
+                                             baseline.get("throughput_spread_rps", 0.0))
+    under = sum(rps < floor for rps in results["throughput_runs_rps"])
+    if under * 2 > runs:
+        regressions.append(
+            f"throughput {results['throughput_rps']:.1f} req/s (median), under {floor:.1f} req/s in {under} of "
+            f"{runs} runs; baseline {baseline['throughput_rps']:.1f} req/s"
+        )
+    return regressions
+
+
+def print_report(results):
+    print(f"Medians of {results['runs']} runs")
+    print(f"{'route':<48}{'reqs':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'±p95':>8}{'p99 ms':>10}")
+    for route, r in results["routes"].items():
+        print(f"{route:<48}{r['requests']:>7}{r['errors']:>5}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['p95_spread_ms'] / 2:>8.1f}{r['p99_ms']:>10.1f}")
+    print(f"\n{results['requests']} requests in {results['elapsed_s']:.2f}s: "
+          f"{results['throughput_rps']:.1f} req/s (runs {min(results['throughput_runs_rps']):.1f}-"
+          f"{max(results['throughput_runs_rps']):.1f}), {results['errors']} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent student sessions")
+    parser.add_argument("--iterations", type=int, default=10, help="chapters practiced per session")
+    parser.add_argument("--users", type=int, default=500, help="users generated into the scratch database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=5, help="times the workload is run; medians are compared")
+    parser.add_argument("--baseline", default="default", help="baseline name in bench/baselines/")
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative p95/throughput regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 regressions smaller than this")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    auth.send_otp_email = capture_otp
+    auth.limiter.enabled = False
+    ai.call_llm = fake_llm
+
+    users, chapters = prepare_database(args)
+    results = asyncio.run(run(args, users, chapters))
+    results["config"] = {"sessions": args.sessions, "iterations": args.iterations, "seed": args.seed,
+                         "repeats": args.repeats}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    baseline_path = BASELINE_DIR / f"{args.baseline}.json"
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {baseline_path.relative_to(BACKEND_DIR)}", file=sys.stderr)
+        return
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path.relative_to(BACKEND_DIR)}; run with --save-baseline to record one.",
+              file=sys.stderr)
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("config") != results["config"]:
+        print(f"Baseline was recorded with {baseline.get('config')}; comparing anyway.", file=sys.stderr)
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if results["errors"]:
+        regressions.append(f"{results['errors']} requests failed")
+    if regressions:
+        print(f"\nREGRESSION against {baseline_path.relative_to(BACKEND_DIR)}:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\nOK: within {args.tolerance:.0%} of {baseline_path.relative_to(BACKEND_DIR)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Local fake LLM provider for exercising the AI provider router.
+
+Serves the two streaming APIs app/core/llm.py talks to, OpenRouter's
+`/chat/completions` and Gemini's `/models/{model}:streamGenerateContent`,
+with configurable first-token latency, slow-tail probability, error rate
+and invalid output. Point the app at it to try hedging and failover by hand:
+
+    python bench/fake_providers.py --port 9001 --slow-fraction 0.2 --slow-seconds 8
+    python bench/fake_providers.py --port 9002
+    OPENROUTER_BASE_URL=http://127.0.0.1:9001 GEMINI_BASE_URL=http://127.0.0.1:9002 \\
+        GEMINI_API_KEY=fake uvicorn app.main:app
+
+`serving()` runs one in-process on a free port; tests/test_llm_router.py
+checks the router's behaviour against them and bench/llm_router.py times it.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import socket
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# A valid answer for both generate endpoints' JSON checks
+ANSWER = json.dumps([
+    {"question": "What is a rational number?", "option_a": "p/q with q != 0", "option_b": "An irrational root",
+     "option_c": "Only integers", "option_d": "Only fractions", "correct": "A"},
+])
+
+
+class Behaviour:
+    """How the fake provider answers; fields can be changed while it is serving."""
+
+    def __init__(self, first_token_seconds: float = 0.05, chunk_seconds: float = 0.005, slow_fraction: float = 0.0,
+                 slow_seconds: float = 5.0, error_rate: float = 0.0, invalid_rate: float = 0.0, seed: int = 0):
+        self.first_token_seconds = first_token_seconds
+        self.chunk_seconds = chunk_seconds
+        self.slow_fraction = slow_fraction
+        self.slow_seconds = slow_seconds
+        self.error_rate = error_rate
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.cancelled = 0  # streams the client hung up on
+
+
+def create_app(behaviour: Behaviour) -> Starlette:
+    async def respond(format_chunk):
+        behaviour.requests += 1
+        if behaviour.rng.random() < behaviour.error_rate:
+            return JSONResponse({"error": {"message": "fake upstream failure"}}, status_code=503)
+        delay = behaviour.slow_seconds if behaviour.rng.random() < behaviour.slow_fraction \
+            else behaviour.first_token_seconds
+        text = "Sorry, I can't help with that." if behaviour.rng.random() < behaviour.invalid_rate else ANSWER
+        chunks = [text[i:i + 40] for i in range(0, len(text), 40)]
+
+        async def events():
+            try:
+                await asyncio.sleep(delay)
+                for chunk in chunks:
+                    yield f"data: {json.dumps(format_chunk(chunk))}\n\n"
+                    await asyncio.sleep(behaviour.chunk_seconds)
+                yield "data: [DONE]\n\n"
+            except asyncio.CancelledError:
+                behaviour.cancelled += 1
+                raise
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def openrouter(request: Request):
+        await request.json()
+        return await respond(lambda text: {"choices": [{"delta": {"content": text}}]})
+
+    async def gemini(request: Request):
+        await request.json()
+        if not request.path_params["action"].endswith(":streamGenerateContent"):
+            return JSONResponse({"error": "not found"}, status_code=404)
+        return await respond(lambda text: {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    return Starlette(routes=[
+        Route("/chat/completions", openrouter, methods=["POST"]),
+        Route("/models/{action}", gemini, methods=["POST"]),
+    ])
+
+
+@contextlib.asynccontextmanager
+async def serving(behaviour: Behaviour):
+    """Serve a fake provider on a free local port for the duration of the block; yields its base URL."""
+    import uvicorn
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(create_app(behaviour), log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a fake streaming LLM provider.")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--first-token-seconds", type=float, default=0.05)
+    parser.add_argument("--slow-fraction", type=float, default=0.0, help="share of requests with a slow first token")
+    parser.add_argument("--slow-seconds", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="share of answers that are not JSON")
+    args = parser.parse_args()
+    behaviour = Behaviour(args.first_token_seconds, slow_fraction=args.slow_fraction, slow_seconds=args.slow_seconds,
+                          error_rate=args.error_rate, invalid_rate=args.invalid_rate)
+    uvicorn.run(create_app(behaviour), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
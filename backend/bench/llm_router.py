@@ -0,0 +1,123 @@
+"""AI provider router benchmark against local fake providers.
+
+Starts two fake streaming providers in-process (bench/fake_providers.py), one
+speaking the OpenRouter API and one the Gemini API, and sends prompts through
+app/core/llm.py's ProviderRouter under scripted failure modes. Each scenario
+reports latency percentiles, how many requests each provider saw and how many
+were cancelled as hedge losers. This is for timing only; the behaviour the
+router promises (hedging, failover, circuit breaking, demotion) is checked by
+tests/test_llm_router.py. Run from the backend directory:
+
+    python bench/llm_router.py
+    python bench/llm_router.py --calls 400 --concurrency 20 --json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.core.llm import CircuitBreaker, GeminiProvider, OpenRouterProvider, ProviderRouter  # noqa: E402
+from fake_providers import Behaviour, serving  # noqa: E402
+
+HEDGE_AFTER = 0.25
+SLOW_SECONDS = 3.0
+BREAKER_FAILURES = 5
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def make_router(primary_url: str, secondary_url, hedge_after: float = HEDGE_AFTER) -> ProviderRouter:
+    providers = [OpenRouterProvider("fake", primary_url, "fake-model", 30.0,
+                                    CircuitBreaker(BREAKER_FAILURES, 60.0))]
+    if secondary_url:
+        providers.append(GeminiProvider("fake", secondary_url, "fake-model", 30.0,
+                                        CircuitBreaker(BREAKER_FAILURES, 60.0)))
+    return ProviderRouter(providers, hedge_after)
+
+
+async def drive(router: ProviderRouter, calls: int, concurrency: int):
+    latencies, failures = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await router.complete("Generate questions", validate=json.loads)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies, failures, time.perf_counter() - started
+
+
+SCENARIOS = {
+    # name: (primary behaviour, secondary behaviour or None)
+    "healthy": (dict(), dict()),
+    "slow tail, no secondary": (dict(slow_fraction=0.1, slow_seconds=SLOW_SECONDS), None),
+    "slow tail, hedged": (dict(slow_fraction=0.1, slow_seconds=SLOW_SECONDS), dict()),
+    "primary down": (dict(error_rate=1.0), dict()),
+    "invalid answers": (dict(invalid_rate=0.3), dict()),
+}
+
+
+async def run(args):
+    results = {}
+    for seed, (name, (primary_config, secondary_config)) in enumerate(SCENARIOS.items()):
+        primary = Behaviour(seed=seed, **primary_config)
+        secondary = Behaviour(seed=seed + 100, **secondary_config) if secondary_config is not None else None
+        async with contextlib.AsyncExitStack() as servers:
+            primary_url = await servers.enter_async_context(serving(primary))
+            secondary_url = await servers.enter_async_context(serving(secondary)) if secondary else None
+            router = make_router(primary_url, secondary_url)
+            latencies, failures, elapsed = await drive(router, args.calls, args.concurrency)
+            await router.aclose()
+        result = {
+            "calls": args.calls,
+            "failures": failures,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "primary_requests": primary.requests,
+            "secondary_requests": secondary.requests if secondary else 0,
+            "cancelled_losers": primary.cancelled + (secondary.cancelled if secondary else 0),
+            "seconds": round(elapsed, 2),
+        }
+        results[name] = result
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI provider router against fake providers.")
+    parser.add_argument("--calls", type=int, default=200, help="prompts per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'scenario':<26} {'p50':>8} {'p95':>8} {'p99':>8} {'failed':>7} {'primary':>8} "
+              f"{'second':>7} {'cancel':>7}")
+        for name, result in results.items():
+            print(f"{name:<26} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                  f"{result['failures']:>7} {result['primary_requests']:>8} {result['secondary_requests']:>7} "
+                  f"{result['cancelled_losers']:>7}")
+
+
+if __name__ == "__main__":
+    main()
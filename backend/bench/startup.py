@@ -0,0 +1,84 @@
+"""Startup-time benchmark: cold import, lifespan startup and first-request latency.
+
+Each run is a fresh interpreter so nothing is already imported or cached.
+Run from the backend directory:
+
+    python bench/startup.py --runs 5
+    python bench/startup.py --max-import-ms 1500 --max-first-request-ms 200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Executed in the child interpreter; prints one JSON line of timings in ms.
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    client.get("/")
+    t3 = time.perf_counter()
+    client.post("/api/v1/auth/login", data={"username": "nobody@example.com", "password": "x"})
+    t4 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "first_db_request_ms": (t4 - t3) * 1000,
+}))
+"""
+
+
+def run_once(env):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-first-request-ms", type=float)
+    parser.add_argument("--json", action="store_true", help="print the medians as JSON")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if "DATABASE_URL" not in env:
+        env["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'startup.db'}"
+
+    run_once(env)  # first run migrates the scratch database; not measured
+    runs = [run_once(env) for _ in range(args.runs)]
+    medians = {key: round(statistics.median(r[key] for r in runs), 1) for key in runs[0]}
+
+    if args.json:
+        print(json.dumps(medians))
+    else:
+        for key, value in medians.items():
+            print(f"{key:<22}{value:>10.1f} ms")
+
+    failed = False
+    if args.max_import_ms is not None and medians["import_ms"] > args.max_import_ms:
+        print(f"import took {medians['import_ms']} ms, budget {args.max_import_ms} ms", file=sys.stderr)
+        failed = True
+    if args.max_first_request_ms is not None and medians["first_request_ms"] > args.max_first_request_ms:
+        print(f"first request took {medians['first_request_ms']} ms, budget {args.max_first_request_ms} ms",
+              file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Check that every query issued by the API routers is served by an index.
+
+Builds a throwaway SQLite database through the Alembic migrations, seeds a
+little data, calls every route once and runs EXPLAIN QUERY PLAN on each
+statement captured along the way. A full-table SCAN that is not listed in
+ALLOWED_SCANS fails the check.
+
+    python check_query_plans.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "query_plans.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["OPENROUTER_API_KEY"] = "query-plan-check"
+os.environ["QUERY_STATS_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.api.v1 import ai  # noqa: E402
+from app.core import security  # noqa: E402
+from app.db import engine, async_engine, async_read_engine, init_db  # noqa: E402
+from app.models import SchoolClass, Subject, Chapter, MCQ, Flashcard, User  # noqa: E402
+from app.reports import build_weekly_reports, week_start_of  # noqa: E402
+
+# (route, table) pairs where reading the whole table is the point of the query
+ALLOWED_SCANS = {
+    ("GET /api/v1/classes", "classes"),
+    ("GET /api/v1/bootstrap", "classes"),
+}
+
+captured = []  # (route, statement, parameters)
+current_route = None
+
+
+def capture(conn, cursor, statement, parameters, context, executemany):
+    if current_route and not executemany:
+        captured.append((current_route, statement, parameters))
+
+
+def seed():
+    with Session(engine) as session:
+        school_class = SchoolClass(name="Class 10")
+        session.add(school_class)
+        session.commit()
+        subject = Subject(name="Mathematics", class_id=school_class.id)
+        session.add(subject)
+        session.commit()
+        chapter = Chapter(title="Real Numbers", subject_id=subject.id)
+        empty_chapter = Chapter(title="Polynomials", subject_id=subject.id)
+        session.add(chapter)
+        session.add(empty_chapter)
+        session.commit()
+        for i in range(5):
+            session.add(MCQ(chapter_id=chapter.id, question=f"Question {i}", option_a="a", option_b="b",
+                            option_c="c", option_d="d", correct="A"))
+            session.add(Flashcard(chapter_id=chapter.id, question=f"Term {i}", answer="Definition"))
+        session.add(User(email="plans@example.com", password_hash=security.get_password_hash("password123"),
+                         class_id=school_class.id))
+        session.commit()
+        return school_class.id, subject.id, chapter.id, empty_chapter.id
+
+
+async def fake_llm(prompt: str) -> str:
+    if "flashcards" in prompt:
+        return '[{"question": "Term", "answer": "Definition"}]'
+    return '[{"question": "Q", "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d", "correct": "A"}]'
+
+
+def main():
+    init_db()
+    class_id, subject_id, chapter_id, empty_chapter_id = seed()
+    ai.call_llm = fake_llm
+
+    from app.main import app
+
+    for eng in {async_engine, async_read_engine}:
+        event.listen(eng.sync_engine, "before_cursor_execute", capture)
+
+    with TestClient(app) as client:
+        api = "/api/v1"
+        called = set()
+
+        def call(method, template, path=None, **kwargs):
+            global current_route
+            current_route = f"{method} {api}{template}"
+            called.add(current_route)
+            response = client.request(method, api + (path or template), **kwargs)
+            current_route = None
+            if response.status_code >= 400:
+                sys.exit(f"{method} {path or template} failed: {response.status_code} {response.text}")
+            return response
+
+        user_id = call("POST", "/auth/login", data={"username": "plans@example.com", "password": "password123"}).json()["user_id"]
+        with Session(engine) as session:
+            otp = session.get(User, user_id).otp_code
+        token = call("POST", "/auth/verify-otp", json={"user_id": user_id, "otp_code": otp}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        call("POST", "/auth/signup", json={"email": "new@example.com", "password": "password123"})
+        call("GET", "/auth/me", headers=headers)
+        call("PATCH", "/auth/me", json={"username": "planner"}, headers=headers)
+        call("GET", "/classes", headers=headers)
+        call("GET", "/subjects/{class_id}", f"/subjects/{class_id}", headers=headers)
+        call("GET", "/chapters/{subject_id}", f"/chapters/{subject_id}", headers=headers)
+        call("GET", "/flashcards/{chapter_id}", f"/flashcards/{chapter_id}", headers=headers)
+        call("GET", "/mcqs/{chapter_id}", f"/mcqs/{chapter_id}", headers=headers)
+        call("GET", "/mcqs/{chapter_id}", f"/mcqs/{chapter_id}?after_id=2&limit=2&fields=question", headers=headers)
+        call("GET", "/flashcards/{chapter_id}", f"/flashcards/{chapter_id}?after_id=2&limit=2", headers=headers)
+        call("POST", "/attempts", json={"chapter_id": chapter_id, "mcq_id": 1, "selected_answer": "A"}, headers=headers)
+        call("POST", "/attempts", json={"chapter_id": chapter_id, "mcq_id": 1, "selected_answer": "A"}, headers=headers)
+        call("GET", "/attempts/{chapter_id}", f"/attempts/{chapter_id}", headers=headers)
+        today = datetime.now(timezone.utc).date()
+        build_weekly_reports(engine, week_start_of(today), progress=None)
+        call("GET", "/revision/report/weekly", f"/revision/report/weekly?week={today}", headers=headers)
+        call("GET", "/chapters/{chapter_id}/session", f"/chapters/{chapter_id}/session?limit=2", headers=headers)
+        call("GET", "/attempts/{chapter_id}/reset-status", f"/attempts/{chapter_id}/reset-status", headers=headers)
+        call("DELETE", "/attempts/{chapter_id}/reset", f"/attempts/{chapter_id}/reset", headers=headers)
+        for _ in range(2):
+            call("POST", "/revision/progress/update",
+                 json={"chapter_id": chapter_id, "correct_answers": 3, "total_questions": 5}, headers=headers)
+        for _ in range(2):  # the retry is replayed from the idempotency store
+            call("POST", "/revision/progress/update",
+                 json={"chapter_id": chapter_id, "correct_answers": 4, "total_questions": 5},
+                 headers={**headers, "Idempotency-Key": "query-plans"})
+        call("GET", "/revision/daily", headers=headers)
+        call("GET", "/revision/progress/stats", headers=headers)
+        call("GET", "/bootstrap", headers=headers)
+        call("GET", "/bootstrap", "/bootstrap?sections=me,stats", headers=headers)
+        call("GET", "/search", "/search?q=question", headers=headers)
+        call("GET", "/search", "/search?q=term&class_id=0&limit=2&offset=2", headers=headers)
+        paper = call("POST", "/exams/{subject_id}/start", f"/exams/{subject_id}/start", headers=headers).json()
+        answers = {question["id"]: "A" for question in paper["questions"]}
+        call("POST", "/exams/submit", json={"token": paper["token"], "answers": answers}, headers=headers)
+        call("POST", "/ai/generate-mcq/{chapter_id}", f"/ai/generate-mcq/{empty_chapter_id}", headers=headers)
+        call("POST", "/ai/generate-flashcard/{chapter_id}", f"/ai/generate-flashcard/{empty_chapter_id}", headers=headers)
+
+    api_routes = {
+        f"{method.upper()} {path}"
+        for path, operations in app.openapi()["paths"].items()
+        if path.startswith(api) and not path.startswith(f"{api}/admin")
+        for method in operations
+    }
+    missed = api_routes - called
+    if missed:
+        sys.exit("Routes not exercised by the query plan check:\n  " + "\n  ".join(sorted(missed)))
+
+    conn = sqlite3.connect(DB_PATH)
+    failures = []
+    checked = 0
+    seen = set()
+    for route, statement, parameters in captured:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        if (route, statement) in seen:
+            continue
+        seen.add((route, statement))
+        checked += 1
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            detail = row[-1]
+            # FTS5 tables report their own index as "SCAN <table> VIRTUAL TABLE INDEX ..."
+            if (not detail.startswith("SCAN ") or "USING" in detail or "VIRTUAL TABLE" in detail
+                    or detail == "SCAN CONSTANT ROW"):
+                continue
+            table = detail.split()[1]
+            if (route, table) not in ALLOWED_SCANS:
+                failures.append(f"{route}\n    {detail}\n    {' '.join(statement.split())}")
+
+    if failures:
+        print(f"{len(failures)} of {checked} queries scan a table without an index:\n")
+        print("\n".join(failures))
+        sys.exit(1)
+    print(f"OK: {checked} distinct queries across {len(called)} routes all use an index.")
+
+
+if __name__ == "__main__":
+    main()
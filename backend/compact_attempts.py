@@ -0,0 +1,41 @@
+"""Fold old MCQ attempts into per-chapter summaries (run nightly, e.g. from cron).
+
+    python compact_attempts.py                  # older than ATTEMPT_RETENTION_DAYS
+    python compact_attempts.py --days 365
+
+Attempts made before the cutoff (midnight UTC, `--days` ago) are moved to
+user_mcq_attempts_archive and counted in attempt_summaries. See
+app/compaction.py.
+"""
+import argparse
+import sys
+from datetime import datetime, time, timedelta, timezone
+
+from app.compaction import USER_RANGE, compact_attempts
+from app.core.config import settings
+from app.db import engine, init_db
+
+# The weekly report job reads raw attempts for the week it builds
+MIN_RETENTION_DAYS = 14
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive and summarise old MCQ attempts.")
+    parser.add_argument("--days", type=int, default=settings.ATTEMPT_RETENTION_DAYS,
+                        help=f"keep this many days of raw attempts (default {settings.ATTEMPT_RETENTION_DAYS})")
+    parser.add_argument("--user-range", type=int, default=USER_RANGE,
+                        help=f"users compacted per transaction (default {USER_RANGE})")
+    args = parser.parse_args()
+    if args.days < MIN_RETENTION_DAYS:
+        sys.exit(f"--days must be at least {MIN_RETENTION_DAYS}: weekly reports are built from raw attempts.")
+
+    today = datetime.now(timezone.utc).date()
+    cutoff = datetime.combine(today - timedelta(days=args.days), time.min, tzinfo=timezone.utc)
+    init_db()
+    print(f"Compacting attempts made before {cutoff:%Y-%m-%d}...")
+    moved = compact_attempts(engine, cutoff, user_range=args.user_range)
+    print(f"Done: {moved:,} attempts archived")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Generate a large, deterministic synthetic dataset for load testing.
+
+    python generate_dataset.py --users 100000 --attempts-per-user 60
+    python generate_dataset.py --users 2000000 --seed 7 --chapters-per-subject 20
+
+The same seed, options and --as-of date on an empty database always
+produce the same rows (only the bcrypt salt of the shared password hash
+varies). Catalogue and questions go through the content
+importer, so re-running reuses them. Users, attempts and progress are
+appended with bulk executemany inserts in large transactions, a chunk of
+users at a time, so memory stays flat at any scale.
+Every generated user's password is "password123".
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.core import security
+from app.db import engine, init_db
+from app.importer import ContentImporter, bulk_insert
+from app.models import SchoolClass, Subject, Chapter, MCQ, User, UserMCQAttempt, Progress
+
+CLASS_SUBJECTS = {
+    **{f"Class {i}": ["Mathematics", "Science", "Social Science", "English"] for i in range(6, 11)},
+    "Class 11": ["Physics", "Chemistry", "Mathematics", "Biology"],
+    "Class 12": ["Physics", "Chemistry", "Mathematics", "Biology"],
+}
+USER_CHUNK = 5000
+HISTORY_DAYS = 120
+
+
+def content_rows(args, rng):
+    for class_name, subjects in CLASS_SUBJECTS.items():
+        for subject in subjects:
+            for c in range(1, args.chapters_per_subject + 1):
+                chapter = {"class": class_name, "subject": subject, "chapter": f"{subject} Chapter {c}"}
+                yield chapter
+                for q in range(1, args.mcqs_per_chapter + 1):
+                    yield {
+                        **chapter, "type": "mcq",
+                        "question": f"{class_name} {subject} chapter {c}, question {q}: which option is correct?",
+                        "option_a": f"Option A for question {q}",
+                        "option_b": f"Option B for question {q}",
+                        "option_c": f"Option C for question {q}",
+                        "option_d": f"Option D for question {q}",
+                        "correct": rng.choice("ABCD"),
+                    }
+                for q in range(1, args.flashcards_per_chapter + 1):
+                    yield {
+                        **chapter, "type": "flashcard",
+                        "question": f"{class_name} {subject} chapter {c}, term {q}",
+                        "answer": f"Definition of term {q} from chapter {c} of {subject}.",
+                    }
+
+
+def load_question_pools(conn):
+    """class_id -> [(mcq_id, chapter_id, correct)] for every generated class."""
+    pools = defaultdict(list)
+    rows = conn.execute(
+        select(Subject.__table__.c.class_id, MCQ.__table__.c.id, MCQ.__table__.c.chapter_id, MCQ.__table__.c.correct)
+        .join(Chapter.__table__, Chapter.__table__.c.id == MCQ.__table__.c.chapter_id)
+        .join(Subject.__table__, Subject.__table__.c.id == Chapter.__table__.c.subject_id)
+        .join(SchoolClass.__table__, SchoolClass.__table__.c.id == Subject.__table__.c.class_id)
+        .where(SchoolClass.__table__.c.name.in_(list(CLASS_SUBJECTS)))
+        .order_by(MCQ.__table__.c.id)
+    )
+    for class_id, mcq_id, chapter_id, correct in rows:
+        pools[class_id].append((mcq_id, chapter_id, correct))
+    return pools
+
+
+def generate_users(args, rng, pools, now):
+    users_t, attempts_t, progress_t = User.__table__, UserMCQAttempt.__table__, Progress.__table__
+    password_hash = security.get_password_hash("password123")  # bcrypt once, not per user
+    class_ids = sorted(pools)
+    totals = {"users": 0, "attempts": 0, "progress": 0}
+    started = time.perf_counter()
+
+    with engine.connect() as conn:
+        next_id = (conn.execute(select(func.max(users_t.c.id))).scalar() or 0) + 1
+
+    remaining = args.users
+    while remaining:
+        chunk = min(USER_CHUNK, remaining)
+        users, attempts, progress = [], [], []
+        for user_id in range(next_id, next_id + chunk):
+            class_id = rng.choice(class_ids)
+            created_at = now - timedelta(days=HISTORY_DAYS + rng.randint(0, 365))
+            users.append({
+                "id": user_id,
+                "email": f"user{user_id}@loadtest.local",
+                "password_hash": password_hash,
+                "created_at": created_at,
+                "username": f"student{user_id}",
+                "class_id": class_id,
+                "user_type": "parent" if rng.random() < 0.1 else "student",
+            })
+
+            pool = pools[class_id]
+            n = min(len(pool), int(rng.expovariate(1 / args.attempts_per_user))) if args.attempts_per_user else 0
+            skill = rng.uniform(0.35, 0.95)
+            per_chapter = defaultdict(lambda: [0, 0, None])
+            for mcq_id, chapter_id, correct in rng.sample(pool, n):
+                is_correct = rng.random() < skill
+                answer = correct if is_correct else rng.choice([c for c in "ABCD" if c != correct])
+                attempted_at = now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))
+                attempts.append({
+                    "user_id": user_id,
+                    "chapter_id": chapter_id,
+                    "mcq_id": mcq_id,
+                    "selected_answer": answer,
+                    "is_correct": is_correct,
+                    "attempted_at": attempted_at,
+                })
+                stats = per_chapter[chapter_id]
+                stats[0] += 1
+                stats[1] += is_correct
+                stats[2] = max(stats[2] or attempted_at, attempted_at)
+            for chapter_id, (total, correct_count, last) in per_chapter.items():
+                progress.append({
+                    "user_id": user_id,
+                    "chapter_id": chapter_id,
+                    "accuracy": correct_count / total * 100,
+                    "streak": rng.randint(1, 10),
+                    "last_practiced": last,
+                })
+
+        with engine.begin() as conn:
+            bulk_insert(conn, users_t, users)
+            if attempts:
+                bulk_insert(conn, attempts_t, attempts)
+            if progress:
+                bulk_insert(conn, progress_t, progress)
+
+        next_id += chunk
+        remaining -= chunk
+        totals["users"] += len(users)
+        totals["attempts"] += len(attempts)
+        totals["progress"] += len(progress)
+        rows = sum(totals.values())
+        elapsed = time.perf_counter() - started
+        print(f"  {totals['users']:>10,} users  {totals['attempts']:>12,} attempts  "
+              f"{totals['progress']:>10,} progress  {rows / elapsed:>10,.0f} rows/s")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--attempts-per-user", type=int, default=40, help="mean answered questions per user")
+    parser.add_argument("--chapters-per-subject", type=int, default=12)
+    parser.add_argument("--mcqs-per-chapter", type=int, default=40)
+    parser.add_argument("--flashcards-per-chapter", type=int, default=15)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="timestamps are generated relative to this date (default today)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.combine(args.as_of, datetime.min.time(), tzinfo=timezone.utc)
+
+    init_db()
+    print("Generating catalogue and questions...")
+    stats = ContentImporter(engine, batch_size=20000, progress=None).run(content_rows(args, rng))
+    print(f"  {stats.summary()}")
+
+    with engine.connect() as conn:
+        pools = load_question_pools(conn)
+
+    print(f"Generating {args.users:,} users with attempts and progress...")
+    started = time.perf_counter()
+    totals = generate_users(args, rng, pools, now)
+    print(f"Done in {time.perf_counter() - started:.1f}s: "
+          f"{totals['users']:,} users, {totals['attempts']:,} attempts, {totals['progress']:,} progress rows.")
+
+
+if __name__ == "__main__":
+    main()
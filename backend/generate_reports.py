@@ -0,0 +1,33 @@
+"""Build the weekly progress reports (run nightly, e.g. from cron).
+
+    python generate_reports.py                  # the week containing yesterday
+    python generate_reports.py --week 2026-10-12
+
+Re-running for a week replaces that week's rows, so the nightly run keeps
+the current week's reports up to date until it ends.
+"""
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+from app.db import engine, init_db
+from app.reports import USER_RANGE, build_weekly_reports, week_start_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build weekly progress reports.")
+    parser.add_argument("--week", type=date.fromisoformat,
+                        help="any day in the week to build (default: the week containing yesterday, UTC)")
+    parser.add_argument("--user-range", type=int, default=USER_RANGE,
+                        help=f"users aggregated per transaction (default {USER_RANGE})")
+    args = parser.parse_args()
+
+    day = args.week or (datetime.now(timezone.utc).date() - timedelta(days=1))
+    week_start = week_start_of(day)
+    init_db()
+    print(f"Building reports for the week of {week_start}...")
+    written = build_weekly_reports(engine, week_start, user_range=args.user_range)
+    print(f"Done: {written:,} reports")
+
+
+if __name__ == "__main__":
+    main()
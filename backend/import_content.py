@@ -0,0 +1,30 @@
+"""Bulk-import NCERT content (classes, subjects, chapters, MCQs, flashcards).
+
+    python import_content.py syllabus.jsonl extra_questions.csv --batch-size 5000
+
+See app/importer.py for the file format. Re-running an import is safe:
+existing rows are matched and only changed fields are updated.
+"""
+import argparse
+from pathlib import Path
+
+from app.db import engine, init_db
+from app.importer import BATCH_SIZE, ContentImporter, read_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import NCERT content files.")
+    parser.add_argument("files", nargs="+", type=Path, help=".csv, .jsonl/.ndjson or .json files")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"rows per transaction (default {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    init_db()
+    for path in args.files:
+        print(f"Importing {path}...")
+        stats = ContentImporter(engine, batch_size=args.batch_size).run(read_rows(path))
+        print(f"Done: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Rebuild the full-text search index from the mcqs and flashcards tables.
+
+    python rebuild_search_index.py
+
+Triggers keep the index current, so this is only needed after writing to the
+database with triggers bypassed (e.g. restoring a dump taken without them) or
+to compact the index. SQLite only.
+"""
+import sys
+import time
+
+from app.db import engine, init_db, is_sqlite
+from app.search import rebuild
+
+
+def main():
+    if not is_sqlite:
+        sys.exit("The full-text index is SQLite-only; other databases search with LIKE.")
+    init_db()
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        indexed = rebuild(conn)
+    print(f"Indexed {indexed:,} questions and flashcards in {time.perf_counter() - started:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Fixtures running the API against each database engine configuration.
+
+The API serves every route from async engines. Each configuration gets a
+fresh database, migrated by the app's own startup check through the sync
+engine, and the module-level engines in app.db are swapped for ones built
+for that configuration:
+
+- sqlite-split: the SQLITE_TUNED profile, one writer connection plus a
+  query_only read pool (aiosqlite)
+- sqlite-single: one async engine for reads and writes (aiosqlite)
+- postgresql: asyncpg, only when TEST_POSTGRES_URL points at a database
+  the tests may wipe
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Set before app.db is imported so nothing ever opens the development database
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'import.db')}"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlmodel import Session, create_engine  # noqa: E402
+
+import app.db as db  # noqa: E402
+import app.main as main  # noqa: E402
+from app.api.v1 import auth as auth_routes  # noqa: E402
+from app.core import security  # noqa: E402
+from app.models import Chapter, Flashcard, MCQ, SchoolClass, Subject, User  # noqa: E402
+
+CONFIGURATIONS = ["sqlite-split", "sqlite-single", "postgresql"]
+PASSWORD = "correct horse"
+
+
+def _engines(configuration: str, tmp_path: Path):
+    """(sync engine, async writer, async reader) for a configuration."""
+    if configuration == "postgresql":
+        url = os.environ.get("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("set TEST_POSTGRES_URL to run against PostgreSQL")
+        sync_engine = create_engine(url)
+        with sync_engine.begin() as conn:
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+        writer = create_async_engine(db.to_async_url(url))
+        return sync_engine, writer, writer
+
+    url = f"sqlite:///{tmp_path / 'api.db'}"
+    sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    event.listen(sync_engine, "connect", db._sqlite_pragmas(read_only=False))
+    if configuration == "sqlite-single":
+        writer = create_async_engine(db.to_async_url(url))
+        return sync_engine, writer, writer
+    writer = create_async_engine(db.to_async_url(url), pool_size=1, max_overflow=0)
+    reader = create_async_engine(db.to_async_url(url), pool_size=4, max_overflow=0)
+    event.listen(writer.sync_engine, "connect", db._sqlite_pragmas(read_only=False))
+    event.listen(reader.sync_engine, "connect", db._sqlite_pragmas(read_only=True))
+    return sync_engine, writer, reader
+
+
+@pytest.fixture(params=CONFIGURATIONS)
+def engines(request, tmp_path, monkeypatch):
+    sync_engine, writer, reader = _engines(request.param, tmp_path)
+    for module in (db, main):
+        monkeypatch.setattr(module, "async_engine", writer)
+        monkeypatch.setattr(module, "async_read_engine", reader)
+    monkeypatch.setattr(db, "engine", sync_engine)
+    yield sync_engine
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def client(engines):
+    auth_routes.limiter.reset()
+    with TestClient(main.create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def content(client, engines):
+    """A class with one subject, two chapters and a user in that class; ids by name."""
+    with Session(engines) as session:
+        school_class = SchoolClass(name="Class 10")
+        session.add(school_class)
+        session.flush()
+        subject = Subject(name="Science", class_id=school_class.id)
+        session.add(subject)
+        session.flush()
+        chapter = Chapter(title="Life Processes", subject_id=subject.id)
+        other_chapter = Chapter(title="Light", subject_id=subject.id)
+        session.add_all([chapter, other_chapter])
+        session.flush()
+        mcqs = [
+            MCQ(chapter_id=chapter.id, question=f"Which organ performs photosynthesis? ({i})",
+                option_a="Leaf", option_b="Root", option_c="Stem", option_d="Flower", correct="A")
+            for i in range(6)
+        ]
+        session.add_all(mcqs)
+        session.add_all(
+            Flashcard(chapter_id=chapter.id, question=f"Define respiration ({i})", answer="Releasing energy")
+            for i in range(4)
+        )
+        user = User(email="student@example.com", password_hash=security.get_password_hash(PASSWORD),
+                    class_id=school_class.id)
+        session.add(user)
+        session.commit()
+        return {
+            "class_id": school_class.id, "subject_id": subject.id, "chapter_id": chapter.id,
+            "other_chapter_id": other_chapter.id, "mcq_ids": [mcq.id for mcq in mcqs], "user_id": user.id,
+        }
+
+
+@pytest.fixture
+def auth(client, engines, content):
+    """Bearer headers for the seeded user, through the real login and OTP flow."""
+    response = client.post("/api/v1/auth/login", data={"username": "student@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    with Session(engines) as session:
+        otp_code = session.get(User, content["user_id"]).otp_code
+    response = client.post("/api/v1/auth/verify-otp", json={"user_id": content["user_id"], "otp_code": otp_code})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,52 @@
+"""AI generation: a burst of slow provider calls must not starve the rest of the API."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlmodel import Session
+
+from app.api.v1 import ai
+from app.core.admission import AdmissionGate
+from app.core.config import settings
+from app.core.llm import CircuitBreaker, OpenRouterProvider, ProviderRouter
+from app.models import ApiUsage
+
+LLM_SECONDS = 1.0
+GENERATIONS = settings.AI_MAX_CONCURRENCY + settings.AI_QUEUE_SIZE
+
+
+async def slow_llm(prompt: str) -> str:
+    await asyncio.sleep(LLM_SECONDS)
+    return '[{"question": "Q", "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d", "correct": "A"}]'
+
+
+def test_catalogue_answers_during_a_generation_burst(client, engines, content, auth, monkeypatch):
+    # The gate's semaphore belongs to one event loop, and each client runs its own
+    monkeypatch.setattr(ai, "ai_gate", AdmissionGate(
+        "ai-test", limit=settings.AI_MAX_CONCURRENCY, queue_size=settings.AI_QUEUE_SIZE,
+        queue_timeout=GENERATIONS * LLM_SECONDS, retry_after=settings.AI_RETRY_AFTER_SECONDS,
+    ))
+    monkeypatch.setattr(ai, "ai_router", ProviderRouter(
+        [OpenRouterProvider("test", "http://provider.invalid", "test-model", 1.0, CircuitBreaker(5, 60.0))], 1.0
+    ))
+    monkeypatch.setattr(ai, "call_llm", slow_llm)
+    with Session(engines) as session:
+        # Every generation then updates one usage row instead of racing to insert it
+        session.add(ApiUsage(user_id=content["user_id"], usage_date=date.today(), request_count=-GENERATIONS))
+        session.commit()
+
+    url = f"/api/v1/ai/generate-mcq/{content['other_chapter_id']}"
+    with ThreadPoolExecutor(GENERATIONS) as pool:
+        generations = [pool.submit(client.post, url, headers=auth) for _ in range(GENERATIONS)]
+        time.sleep(LLM_SECONDS / 2)
+        assert not any(generation.done() for generation in generations)
+        started = time.perf_counter()
+        classes = client.get("/api/v1/classes", headers=auth)
+        elapsed = time.perf_counter() - started
+        assert not all(generation.done() for generation in generations)
+        statuses = [generation.result().status_code for generation in generations]
+
+    assert classes.status_code == 200, classes.text
+    assert elapsed < LLM_SECONDS / 2
+    assert statuses == [200] * GENERATIONS
@@ -0,0 +1,136 @@
+"""The async routes behave the same under every engine configuration in conftest.py."""
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Progress, UserMCQAttempt
+
+
+def test_signup_and_profile(client, auth):
+    response = client.post("/api/v1/auth/signup", json={"email": "new@example.com", "password": "pw"})
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == "new@example.com"
+    duplicate = client.post("/api/v1/auth/signup", json={"email": "new@example.com", "password": "pw"})
+    assert duplicate.status_code == 400
+
+    response = client.patch("/api/v1/auth/me", json={"username": "asha"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert client.get("/api/v1/auth/me", headers=auth).json()["username"] == "asha"
+
+
+def test_requires_a_valid_token(client, content):
+    assert client.get("/api/v1/classes").status_code == 401
+    invalid = client.get("/api/v1/classes", headers={"Authorization": "Bearer not-a-token"})
+    assert invalid.status_code == 403
+
+
+def test_catalogue(client, content, auth):
+    classes = client.get("/api/v1/classes", headers=auth).json()
+    assert [c["id"] for c in classes] == [content["class_id"]]
+    subjects = client.get(f"/api/v1/subjects/{content['class_id']}", headers=auth).json()
+    assert [s["id"] for s in subjects] == [content["subject_id"]]
+    chapters = client.get(f"/api/v1/chapters/{content['subject_id']}", headers=auth).json()
+    assert {c["id"] for c in chapters} == {content["chapter_id"], content["other_chapter_id"]}
+
+    mcqs = client.get(f"/api/v1/mcqs/{content['chapter_id']}", headers=auth).json()
+    assert [m["id"] for m in mcqs] == content["mcq_ids"]
+    flashcards = client.get(f"/api/v1/flashcards/{content['chapter_id']}", headers=auth).json()
+    assert len(flashcards) == 4
+    assert client.get(f"/api/v1/mcqs/{content['other_chapter_id']}", headers=auth).json() == []
+
+
+def test_question_paging_is_opt_in(client, content, auth, monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_SIZE_DEFAULT", 2)
+    url = f"/api/v1/mcqs/{content['chapter_id']}"
+    everything = client.get(url, headers=auth)
+    assert [m["id"] for m in everything.json()] == content["mcq_ids"]
+    assert "X-Next-Cursor" not in everything.headers
+
+    pages, params = [], {"limit": 4}
+    while True:
+        response = client.get(url, params=params, headers=auth)
+        pages.append([m["id"] for m in response.json()])
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 4, "after_id": response.headers["X-Next-Cursor"]}
+    assert pages == [content["mcq_ids"][:4], content["mcq_ids"][4:]]
+    assert response.headers["X-Total-Count"] == "6"
+
+
+def test_session_pages_mcqs_only_on_request(client, content, auth, monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_SIZE_DEFAULT", 2)
+    url = f"/api/v1/chapters/{content['chapter_id']}/session"
+    everything = client.get(url, headers=auth).json()
+    assert [m["id"] for m in everything["mcqs"]] == content["mcq_ids"]
+    assert everything["next_cursor"] is None
+    assert everything["mcq_count"] == 6
+
+    page = client.get(url, params={"limit": 4}, headers=auth).json()
+    assert [m["id"] for m in page["mcqs"]] == content["mcq_ids"][:4]
+    assert page["next_cursor"] == content["mcq_ids"][3]
+    assert page["mcq_count"] == 6
+
+
+def test_attempts_and_progress(client, engines, content, auth):
+    chapter_id, mcq_ids = content["chapter_id"], content["mcq_ids"]
+    for mcq_id, answer in zip(mcq_ids[:3], "ABA"):
+        response = client.post("/api/v1/attempts", headers=auth,
+                               json={"chapter_id": chapter_id, "mcq_id": mcq_id, "selected_answer": answer})
+        assert response.status_code == 201, response.text
+        assert response.json() == {"message": "saved"}
+    repeat = client.post("/api/v1/attempts", headers=auth,
+                         json={"chapter_id": chapter_id, "mcq_id": mcq_ids[0], "selected_answer": "B"})
+    assert repeat.json() == {"message": "already recorded"}
+
+    attempts = client.get(f"/api/v1/attempts/{chapter_id}", headers=auth).json()
+    assert [(a["selected_answer"], a["is_correct"]) for a in attempts] == [("A", True), ("B", False), ("A", True)]
+
+    for correct in (2, 4):
+        response = client.post("/api/v1/revision/progress/update", headers=auth,
+                               json={"chapter_id": chapter_id, "correct_answers": correct, "total_questions": 4})
+        assert response.status_code == 200, response.text
+    assert response.json()["streak"] == 2
+    assert response.json()["accuracy"] == 75.0
+
+    stats = client.get("/api/v1/revision/progress/stats", headers=auth).json()
+    assert stats["questions_answered"] == 3
+    assert stats["questions_correct"] == 2
+
+    # What the async engines wrote is what the sync engine (scripts, migrations) reads
+    with Session(engines) as session:
+        assert len(session.exec(select(UserMCQAttempt)).all()) == 3
+        assert session.exec(select(Progress)).one().streak == 2
+
+
+def test_reset_chapter(client, content, auth):
+    chapter_id = content["chapter_id"]
+    client.post("/api/v1/attempts", headers=auth,
+                json={"chapter_id": chapter_id, "mcq_id": content["mcq_ids"][0], "selected_answer": "A"})
+    response = client.delete(f"/api/v1/attempts/{chapter_id}/reset", headers=auth)
+    assert response.status_code == 200, response.text
+    assert client.get(f"/api/v1/attempts/{chapter_id}", headers=auth).json() == []
+    status = client.get(f"/api/v1/attempts/{chapter_id}/reset-status", headers=auth).json()
+    assert status["reset_count"] == 1
+
+
+def test_bootstrap_sections(client, content, auth):
+    everything = client.get("/api/v1/bootstrap", headers=auth)
+    assert everything.status_code == 200, everything.text
+    assert set(everything.json()) == {"me", "classes", "stats", "daily"}
+
+    chosen = client.get("/api/v1/bootstrap", params={"sections": "me, classes"}, headers=auth).json()
+    assert set(chosen) == {"me", "classes"}
+    assert chosen["me"]["email"] == "student@example.com"
+    assert [c["id"] for c in chosen["classes"]] == [content["class_id"]]
+
+    unknown = client.get("/api/v1/bootstrap", params={"sections": "me,grades"}, headers=auth)
+    assert unknown.status_code == 400
+    assert unknown.json()["detail"] == "Unknown sections: grades"
+
+
+def test_read_screens(client, content, auth):
+    session = client.get(f"/api/v1/chapters/{content['chapter_id']}/session", headers=auth)
+    assert session.status_code == 200, session.text
+    daily = client.get("/api/v1/revision/daily", headers=auth)
+    assert daily.status_code == 200, daily.text
+    search = client.get("/api/v1/search", params={"q": "photosynthesis"}, headers=auth)
+    assert search.status_code == 200, search.text
@@ -0,0 +1,26 @@
+"""Compacted attempts still count as answered and in the lifetime totals."""
+from datetime import datetime, timedelta, timezone
+
+from app.compaction import compact_attempts
+
+
+def answer(client, auth, content, mcq_id, selected="A"):
+    return client.post("/api/v1/attempts", headers=auth,
+                       json={"chapter_id": content["chapter_id"], "mcq_id": mcq_id, "selected_answer": selected})
+
+
+def test_compacted_answers_stay_answered(client, engines, content, auth):
+    mcq_ids = content["mcq_ids"]
+    for mcq_id, selected in zip(mcq_ids[:3], "ABA"):
+        assert answer(client, auth, content, mcq_id, selected).json() == {"message": "saved"}
+    assert compact_attempts(engines, datetime.now(timezone.utc) + timedelta(days=1), progress=None) == 3
+    assert client.get(f"/api/v1/attempts/{content['chapter_id']}", headers=auth).json() == []
+
+    assert answer(client, auth, content, mcq_ids[0], "B").json() == {"message": "already recorded"}
+    assert answer(client, auth, content, mcq_ids[3]).json() == {"message": "saved"}
+    stats = client.get("/api/v1/revision/progress/stats", headers=auth).json()
+    assert (stats["questions_answered"], stats["questions_correct"]) == (4, 3)
+
+    # A reset clears the compacted marks too, so the chapter can be answered afresh
+    assert client.delete(f"/api/v1/attempts/{content['chapter_id']}/reset", headers=auth).status_code == 200
+    assert answer(client, auth, content, mcq_ids[0]).json() == {"message": "saved"}
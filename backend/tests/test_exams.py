@@ -0,0 +1,52 @@
+"""Mock exam submission, including answers that race a concurrent POST /attempts."""
+from collections import defaultdict
+
+import pytest
+from sqlmodel import Session, select
+
+from app import exams
+from app.models import UserMCQAttempt
+
+
+@pytest.fixture(autouse=True)
+def fresh_paper_caches(monkeypatch):
+    # Paper ids repeat across the per-configuration databases
+    monkeypatch.setattr(exams, "_pools", {})
+    monkeypatch.setattr(exams, "_papers", {})
+    monkeypatch.setattr(exams, "_build_locks", defaultdict(exams.asyncio.Lock))
+
+
+def test_submit_survives_a_concurrent_attempt(client, engines, content, auth, monkeypatch):
+    paper = client.post(f"/api/v1/exams/{content['subject_id']}/start", headers=auth)
+    assert paper.status_code == 200, paper.text
+    mcq_ids = [question["id"] for question in paper.json()["questions"]]
+    raced = mcq_ids[0]
+
+    answered_mcq_ids = exams.answered_mcq_ids
+    calls = []
+
+    async def answered_then_race(session, user_id, ids):
+        answered = await answered_mcq_ids(session, user_id, ids)
+        if not calls:
+            # POST /attempts lands between grading and commit
+            with Session(engines) as other:
+                other.add(UserMCQAttempt(user_id=user_id, chapter_id=content["chapter_id"], mcq_id=raced,
+                                         selected_answer="B", is_correct=False))
+                other.commit()
+        calls.append(ids)
+        return answered
+
+    monkeypatch.setattr(exams, "answered_mcq_ids", answered_then_race)
+    submission = {"token": paper.json()["token"], "answers": {mcq_id: "A" for mcq_id in mcq_ids}}
+    response = client.post("/api/v1/exams/submit", json=submission, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json()["correct"] == len(mcq_ids)
+    assert len(calls) == 2
+
+    with Session(engines) as session:
+        attempts = {a.mcq_id: a.selected_answer for a in session.exec(select(UserMCQAttempt)).all()}
+    assert attempts == {mcq_id: "B" if mcq_id == raced else "A" for mcq_id in mcq_ids}
+
+    again = client.post("/api/v1/exams/submit", json=submission, headers=auth)
+    assert again.status_code == 409
+    assert again.json()["detail"] == "This exam has already been submitted"
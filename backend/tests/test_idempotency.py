@@ -0,0 +1,33 @@
+"""Idempotency-Key replay on the retried write routes, and nothing stored elsewhere."""
+from sqlmodel import Session, select
+
+from app.models import IdempotencyKey, User
+from conftest import PASSWORD
+
+
+def test_progress_update_is_replayed(client, content, auth):
+    headers = {**auth, "Idempotency-Key": "retry-1"}
+    body = {"chapter_id": content["chapter_id"], "correct_answers": 3, "total_questions": 4}
+    first = client.post("/api/v1/revision/progress/update", json=body, headers=headers)
+    retry = client.post("/api/v1/revision/progress/update", json=body, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert retry.json()["streak"] == 1
+
+    reused = client.post("/api/v1/revision/progress/update", json={**body, "correct_answers": 1}, headers=headers)
+    assert reused.status_code == 422
+
+
+def test_auth_responses_are_never_stored(client, engines, content):
+    response = client.post("/api/v1/auth/login", headers={"Idempotency-Key": "login-1"},
+                           data={"username": "student@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    with Session(engines) as session:
+        otp_code = session.get(User, content["user_id"]).otp_code
+    response = client.post("/api/v1/auth/verify-otp", headers={"Idempotency-Key": "verify-1"},
+                           json={"user_id": content["user_id"], "otp_code": otp_code})
+    assert "access_token" in response.json()
+    assert "Idempotent-Replayed" not in response.headers
+    with Session(engines) as session:
+        assert session.exec(select(IdempotencyKey)).all() == []
@@ -0,0 +1,104 @@
+"""ProviderRouter against the fake streaming providers in bench/fake_providers.py."""
+import asyncio
+import contextlib
+import json
+import time
+
+import pytest
+
+from app.core.llm import CircuitBreaker, GeminiProvider, OpenRouterProvider, ProviderRouter
+from bench.fake_providers import ANSWER, Behaviour, serving
+
+pytestmark = pytest.mark.anyio
+
+HEDGE_AFTER = 0.2
+SLOW_SECONDS = 2.0
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@contextlib.asynccontextmanager
+async def routed(primary: Behaviour, secondary: Behaviour, breaker_failures: int = 5, cooldown: float = 60.0):
+    """A router over an OpenRouter-style primary and a Gemini-style secondary."""
+    async with serving(primary) as primary_url, serving(secondary) as secondary_url:
+        router = ProviderRouter([
+            OpenRouterProvider("fake", primary_url, "fake-model", 10.0, CircuitBreaker(breaker_failures, cooldown)),
+            GeminiProvider("fake", secondary_url, "fake-model", 10.0, CircuitBreaker(breaker_failures, cooldown)),
+        ], HEDGE_AFTER)
+        try:
+            yield router
+        finally:
+            await router.aclose()
+
+
+async def timed(router: ProviderRouter):
+    started = time.perf_counter()
+    text = await router.complete("Generate questions", validate=json.loads)
+    return text, time.perf_counter() - started
+
+
+async def test_hedge_wins_over_a_slow_first_token():
+    primary, secondary = Behaviour(first_token_seconds=SLOW_SECONDS), Behaviour()
+    async with routed(primary, secondary) as router:
+        text, elapsed = await timed(router)
+        assert text == ANSWER
+        assert HEDGE_AFTER <= elapsed < SLOW_SECONDS / 2
+        assert (primary.requests, secondary.requests) == (1, 1)
+        # The losing stream is hung up on rather than left running
+        for _ in range(50):
+            if primary.cancelled:
+                break
+            await asyncio.sleep(0.02)
+        assert primary.cancelled == 1
+
+
+async def test_failover_does_not_wait_for_the_hedge():
+    primary, secondary = Behaviour(error_rate=1.0), Behaviour()
+    async with routed(primary, secondary) as router:
+        text, elapsed = await timed(router)
+        assert text == ANSWER
+        assert elapsed < HEDGE_AFTER
+        assert (primary.requests, secondary.requests) == (1, 1)
+
+
+async def test_breaker_opens_then_lets_one_trial_through():
+    primary, secondary = Behaviour(error_rate=1.0), Behaviour()
+    async with routed(primary, secondary, breaker_failures=2, cooldown=0.3) as router:
+        breaker = router.providers[0].breaker
+        for _ in range(2):
+            await timed(router)
+        assert breaker.state == CircuitBreaker.OPEN
+        await timed(router)
+        assert primary.requests == 2  # skipped while open
+
+        # Half-open: a failed trial opens it again straight away
+        await asyncio.sleep(0.3)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        await timed(router)
+        assert primary.requests == 3
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # ...and a successful one closes it
+        await asyncio.sleep(0.3)
+        primary.error_rate = 0.0
+        await timed(router)
+        assert primary.requests == 4
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_an_always_slow_primary_is_demoted():
+    primary, secondary = Behaviour(first_token_seconds=SLOW_SECONDS), Behaviour()
+    async with routed(primary, secondary) as router:
+        slow, fast = router.providers
+        await timed(router)
+        # The primary never produced a token, but waited past the hedge delay before being cancelled
+        assert slow.ttft_ewma > HEDGE_AFTER
+        assert router.candidates() == [fast, slow]
+
+        text, elapsed = await timed(router)
+        assert text == ANSWER
+        assert elapsed < HEDGE_AFTER
+        assert (primary.requests, secondary.requests) == (1, 2)
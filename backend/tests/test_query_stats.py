@@ -0,0 +1,11 @@
+"""Statement grouping in app.core.query_stats."""
+from app.core import query_stats
+
+
+def test_repeated_honours_an_explicit_threshold():
+    stats = query_stats.RequestQueryStats()
+    for user_id in range(3):
+        stats.record(f"SELECT * FROM users WHERE id = {user_id}", 0.001)
+    stats.record("SELECT * FROM chapters", 0.001)
+    assert stats.repeated(threshold=0) == {"SELECT * FROM users WHERE id = ?": 3, "SELECT * FROM chapters": 1}
+    assert stats.repeated(threshold=3) == {"SELECT * FROM users WHERE id = ?": 3}